@@ -1,15 +1,42 @@
-import asyncio
+from typing import TYPE_CHECKING
 
-from .launcher import AgentLauncher
+from .shared import lazy_exports
 
-try:
-    import uvloop
-except ImportError:
-    import logging
+if TYPE_CHECKING:
+    from .launcher import (
+        AgentLauncher,
+        BatchStats,
+        TaskBatch,
+        TaskResult,
+        TaskStream,
+    )
+    from .pool import AgentLauncherPool
+    from .scheduler import AdmissionScheduler, SchedulerStats
 
-    logging.warning("uvloop is not installed, using default asyncio event loop.")
-    pass
-else:
-    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+_EXPORTS = {
+    "AdmissionScheduler": ".scheduler",
+    "AgentLauncher": ".launcher",
+    "AgentLauncherPool": ".pool",
+    "BatchStats": ".launcher",
+    "SchedulerStats": ".scheduler",
+    "TaskBatch": ".launcher",
+    "TaskResult": ".launcher",
+    "TaskStream": ".launcher",
+}
+__getattr__ = lazy_exports(__name__, _EXPORTS)
 
-__all__ = ["AgentLauncher"]
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
+
+
+__all__ = [
+    "AdmissionScheduler",
+    "AgentLauncher",
+    "AgentLauncherPool",
+    "BatchStats",
+    "SchedulerStats",
+    "TaskBatch",
+    "TaskResult",
+    "TaskStream",
+]
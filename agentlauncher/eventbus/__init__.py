@@ -1,5 +1,66 @@
-from .bus import EventBus
+from typing import TYPE_CHECKING
+
+from agentlauncher.shared import lazy_exports
+
+from .bus import EventBus, EventBusStats
+from .cancel import CancellationToken, TokenCancelledError
+from .coalesce import DeltaCoalescer
 from .context import EventContext
-from .type import EventBusHook, EventHandler, EventType
+from .hook import EventHookQueue, HookPolicy
+from .type import (
+    DeltaEventType,
+    EventBusHook,
+    EventHandler,
+    EventMatcher,
+    EventType,
+    deadline_field,
+)
+
+if TYPE_CHECKING:
+    from .journal import EventJournal, read_journal, replay_journal
+    from .transport import (
+        EventBroker,
+        EventSerializer,
+        EventTransport,
+        PickleSerializer,
+        UnixSocketTransport,
+    )
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "EventBroker": ".transport",
+        "EventSerializer": ".transport",
+        "EventTransport": ".transport",
+        "PickleSerializer": ".transport",
+        "UnixSocketTransport": ".transport",
+        "EventJournal": ".journal",
+        "read_journal": ".journal",
+        "replay_journal": ".journal",
+    },
+)
 
-__all__ = ["EventBus", "EventHandler", "EventType", "EventBusHook", "EventContext"]
+__all__ = [
+    "EventBus",
+    "EventBusStats",
+    "EventBroker",
+    "EventJournal",
+    "EventSerializer",
+    "PickleSerializer",
+    "EventTransport",
+    "UnixSocketTransport",
+    "DeltaCoalescer",
+    "DeltaEventType",
+    "EventHandler",
+    "EventMatcher",
+    "EventType",
+    "EventBusHook",
+    "EventHookQueue",
+    "HookPolicy",
+    "EventContext",
+    "CancellationToken",
+    "TokenCancelledError",
+    "read_journal",
+    "replay_journal",
+    "deadline_field",
+]
@@ -1,56 +1,522 @@
 import asyncio
+import inspect
 import logging
-from collections import defaultdict
-from typing import Any
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
-from agentlauncher.shared import get_primary_agent_id
+from agentlauncher.shared import AgentId
 
-from .type import EventBusHook, EventHandler, EventType
+from .cancel import CancellationToken
+from .coalesce import DeltaCoalescer
+from .dispatch import DispatchTable, Subscription
+from .supervisor import TaskSupervisor
+from .type import EventBusHook, EventHandler, EventMatcher, EventType
+
+if TYPE_CHECKING:
+    from .transport import EventTransport
+
+_in_worker: ContextVar[bool] = ContextVar("_in_worker", default=False)
+
+
+@dataclass
+class EventBusStats:
+    queue_depth: int
+    queue_size: int
+    worker_count: int
+    spare_workers: int
+    active_lanes: int
+    in_flight_tasks: int
+    supervised_agents: int
+    leaked_tasks: int
+    dropped_events: int
+    failed_handlers: int
 
 
 class EventBus:
-    def __init__(self):
-        self._subscribers: dict[type[EventType], list[EventHandler[Any]]] = defaultdict(
+    def __init__(
+        self,
+        worker_count: int = 0,
+        queue_size: int = 1024,
+        put_timeout: float | None = None,
+        ordered_lanes: bool = False,
+        coalescer: DeltaCoalescer | None = None,
+        transport: "EventTransport | None" = None,
+    ):
+        if worker_count < 0:
+            raise ValueError("worker_count must be non-negative.")
+        if worker_count and queue_size <= 0:
+            raise ValueError("queue_size must be positive in worker pool mode.")
+        self._subscriptions: dict[type[EventType], list[Subscription]] = defaultdict(
             list
         )
-        self._hooks: dict[str, EventBusHook] = {}
-        self._hook_lock = asyncio.Lock()
+        self._routes = DispatchTable(self._subscriptions, ordered_lanes)
+        self._hooks: dict[str, tuple[EventBusHook, ...]] = {}
+        self._hook_routes: dict[str, tuple[EventBusHook, ...]] = {}
+        self._hook_backlogs: dict[EventBusHook, deque[EventType | None]] = {}
+        self._hook_tasks: set[asyncio.Task[None]] = set()
+        self._primary_ids: dict[str, str] = {}
+        self._sub_agents: dict[str, list[str]] = {}
+        self._tokens: dict[str, CancellationToken] = {}
         self._logger = logging.getLogger(__name__)
+        self._worker_count = worker_count
+        self._queue_size = queue_size if worker_count else 0
+        self._put_timeout = put_timeout
+        self._queue: asyncio.Queue[tuple[EventHandler[Any], EventType]] | None = (
+            asyncio.Queue(maxsize=queue_size) if worker_count else None
+        )
+        self._workers: list[asyncio.Task[None]] = []
+        self._spares: set[asyncio.Task[None]] = set()
+        self._ordered_lanes = ordered_lanes
+        self._lanes: dict[str, deque[tuple[EventHandler[Any], EventType]]] = {}
+        self._lane_tasks: set[asyncio.Task[None]] = set()
+        self._supervisor = TaskSupervisor(self._handler_failed)
+        self._coalescer = coalescer
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self._flush_backlogs: dict[str, deque[EventType]] = {}
+        if coalescer is not None:
+            coalescer.bind(self._on_coalesce_expire)
+        self._transport = transport
+        self._transport_started = False
+        self._dropped_events = 0
+        self._failed_handlers = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def dropped_events(self) -> int:
+        return self._dropped_events
+
+    @property
+    def lanes_enabled(self) -> bool:
+        return self._ordered_lanes
+
+    @property
+    def stats(self) -> EventBusStats:
+        return EventBusStats(
+            queue_depth=self.queue_depth,
+            queue_size=self._queue_size,
+            worker_count=self._worker_count,
+            spare_workers=len(self._spares),
+            active_lanes=len(self._lanes),
+            in_flight_tasks=self._supervisor.in_flight,
+            supervised_agents=self._supervisor.group_count,
+            leaked_tasks=self._supervisor.leaked,
+            dropped_events=self._dropped_events,
+            failed_handlers=self._failed_handlers,
+        )
 
     def subscribe(
-        self, event_type: type[EventType], handler: EventHandler[Any]
+        self,
+        event_type: type[EventType],
+        handler: EventHandler[Any],
+        *,
+        priority: int = 0,
+        ordered: bool = False,
+        remote: bool = False,
+        agent_prefix: str | None = None,
+        where: Mapping[str, Any] | EventMatcher | None = None,
     ) -> None:
-        self._subscribers[event_type].append(handler)
+        self._subscriptions[event_type].append(
+            Subscription.create(
+                event_type, handler, priority, ordered, remote, agent_prefix, where
+            )
+        )
+        self._routes.clear()
+
+    def primary_agent_id(self, agent_id: str) -> str:
+        primary_agent_id = self._primary_ids.get(agent_id)
+        if primary_agent_id is not None:
+            return primary_agent_id
+        return agent_id.primary if type(agent_id) is AgentId else agent_id
+
+    def register_sub_agent(self, agent_id: str, parent_agent_id: str) -> None:
+        primary_agent_id = self.primary_agent_id(parent_agent_id)
+        self._primary_ids[agent_id] = primary_agent_id
+        sub_agents = self._sub_agents.get(primary_agent_id)
+        if sub_agents is None:
+            sub_agents = self._sub_agents[primary_agent_id] = []
+        sub_agents.append(agent_id)
+        if primary_agent_id in self._hooks:
+            self._hook_routes[agent_id] = self._hook_route(agent_id)
+
+    def open_cancellation_token(
+        self, agent_id: str, deadline: float | None = None
+    ) -> CancellationToken:
+        primary_agent_id = self.primary_agent_id(agent_id)
+        token = self._tokens.get(primary_agent_id)
+        if token is None:
+            token = self._tokens[primary_agent_id] = CancellationToken(deadline)
+        elif deadline is not None:
+            token.deadline = deadline
+        return token
+
+    def cancellation_token(self, agent_id: str) -> CancellationToken:
+        token = self._tokens.get(self.primary_agent_id(agent_id))
+        return CancellationToken() if token is None else token
+
+    def release_agent(self, primary_agent_id: str) -> None:
+        self._tokens.pop(primary_agent_id, None)
+        for agent_id in self._sub_agents.pop(primary_agent_id, ()):
+            self._primary_ids.pop(agent_id, None)
+            if agent_id in self._hooks:
+                self._hook_routes[agent_id] = self._hooks[agent_id]
+            else:
+                self._hook_routes.pop(agent_id, None)
+
+    async def start(self) -> None:
+        if self._transport is None or self._transport_started:
+            return
+        self._transport_started = True
+        await self._transport.start(self)
+
+    def owns_agent(self, agent_id: str) -> bool:
+        return self._transport is None or self._transport.owns(
+            self.primary_agent_id(agent_id)
+        )
+
+    async def watch(self, agent_id: str) -> None:
+        if not self.owns_agent(agent_id):
+            assert self._transport is not None
+            await self.start()
+            await self._transport.watch(self.primary_agent_id(agent_id))
+
+    async def unwatch(self, agent_id: str) -> None:
+        if not self.owns_agent(agent_id):
+            assert self._transport is not None
+            await self._transport.unwatch(self.primary_agent_id(agent_id))
 
     async def add_hook(self, agent_id: str, hook: EventBusHook) -> None:
-        async with self._hook_lock:
-            self._hooks[agent_id] = hook
+        await self.watch(agent_id)
+        self._hooks[agent_id] = self._hooks.get(agent_id, ()) + (hook,)
+        self._rebuild_hook_routes(agent_id)
+
+    async def remove_hook(
+        self, agent_id: str, hook: EventBusHook | None = None
+    ) -> None:
+        current = self._hooks.get(agent_id, ())
+        removed = current if hook is None else tuple(h for h in current if h is hook)
+        if not removed:
+            return
+        remaining = tuple(h for h in current if h not in removed)
+        if remaining:
+            self._hooks[agent_id] = remaining
+        else:
+            del self._hooks[agent_id]
+        self._rebuild_hook_routes(agent_id)
+        for removed_hook in removed:
+            await self.unwatch(agent_id)
+            backlog = self._hook_backlogs.get(removed_hook)
+            if backlog is not None:
+                backlog.append(None)
+            else:
+                await removed_hook.put(None)
+
+    def hooks(self, agent_id: str) -> tuple[EventBusHook, ...]:
+        return self._hooks.get(agent_id, ())
 
-    async def remove_hook(self, agent_id: str) -> None:
-        async with self._hook_lock:
-            hook = self._hooks.pop(agent_id, None)
-            if hook:
-                await hook.put(None)
+    def _hook_route(self, agent_id: str) -> tuple[EventBusHook, ...]:
+        hooks = self._hooks.get(agent_id, ())
+        primary_agent_id = self.primary_agent_id(agent_id)
+        if primary_agent_id != agent_id:
+            hooks += self._hooks.get(primary_agent_id, ())
+        return hooks
+
+    def _rebuild_hook_routes(self, agent_id: str) -> None:
+        for target in (agent_id, *self._sub_agents.get(agent_id, ())):
+            hooks = self._hook_route(target)
+            if hooks:
+                self._hook_routes[target] = hooks
+            else:
+                self._hook_routes.pop(target, None)
 
     async def emit(self, event: EventType) -> None:
-        event_type = type(event)
-        handlers = self._subscribers.get(event_type, [])
+        if self._transport is not None:
+            key = self.primary_agent_id(event.agent_id)
+            if not self._transport.owns(key):
+                await self.start()
+                await self._transport.send(key, event)
+                return
+        await self.receive_event(event)
+
+    async def receive_event(self, event: EventType) -> None:
+        if self._coalescer is None:
+            await self._dispatch(event)
+            return
+        backlog = self._flush_backlogs.get(event.agent_id)
+        if backlog is not None:
+            backlog.extend(self._coalescer.add(event))
+            return
+        for ready in self._coalescer.add(event):
+            await self._dispatch(ready)
+
+    async def _dispatch(self, event: EventType) -> None:
+        route = self._routes[type(event)]
         self._log_event(event)
-        for handler in handlers:
-            asyncio.create_task(handler(event))
-        asyncio.create_task(self._invoke_hook(event))
-
-    async def _invoke_hook(self, event: EventType) -> None:
-        async with self._hook_lock:
-            hook = self._hooks.get(event.agent_id, None) or self._hooks.get(
-                get_primary_agent_id(event.agent_id), None
+        hooks = self._hook_routes.get(event.agent_id)
+        if hooks is not None:
+            for hook in hooks:
+                if not self._deliver_hook(hook, event):
+                    await hook.put(event)
+        for handler, matches in route.inline:
+            if matches is None or matches(event):
+                self._call_inline(handler, event)
+        for handler, matches in route.ordered:
+            if matches is None or matches(event):
+                self._enqueue_lane(handler, event)
+        if self._queue is None:
+            key = self.primary_agent_id(event.agent_id)
+            for handler, matches in route.concurrent:
+                if matches is None or matches(event):
+                    self._supervisor.spawn(key, handler(event), handler, event)
+        else:
+            for handler, matches in route.concurrent:
+                if matches is None or matches(event):
+                    await self._enqueue(handler, event)
+        if self._transport is not None:
+            await self._transport.publish(self.primary_agent_id(event.agent_id), event)
+
+    async def receive_observed_event(
+        self, primary_agent_id: str, event: EventType
+    ) -> None:
+        route = self._routes[type(event)]
+        hooks = self._hook_routes.get(event.agent_id) or self._hooks.get(
+            primary_agent_id
+        )
+        if hooks is not None:
+            for hook in hooks:
+                self._forward_hook(hook, event)
+        for handler, matches in route.remote_inline:
+            if matches is None or matches(event):
+                self._call_inline(handler, event)
+        for handler, matches in route.remote_concurrent:
+            if matches is None or matches(event):
+                self._supervisor.spawn(primary_agent_id, handler(event), handler, event)
+
+    def in_flight_tasks(self, agent_id: str) -> int:
+        return self._supervisor.in_flight_for(self.primary_agent_id(agent_id))
+
+    def cancel_agent_tasks(
+        self,
+        agent_id: str,
+        keep: tuple[type[EventType], ...] = (),
+        reason: str | None = None,
+    ) -> int:
+        primary_agent_id = self.primary_agent_id(agent_id)
+        token = self._tokens.get(primary_agent_id)
+        if token is not None:
+            token.cancel(reason or "Task cancelled")
+        cancelled = self._supervisor.cancel(primary_agent_id, keep)
+        if cancelled:
+            self._logger.warning(
+                "[%s] Cancelled %d in-flight handler task(s)", agent_id, cancelled
+            )
+        return cancelled
+
+    async def close(self) -> None:
+        if self._transport is not None and self._transport_started:
+            self._transport_started = False
+            await self._transport.close()
+        if self._coalescer is not None:
+            self._coalescer.clear()
+        tasks = [
+            *self._workers,
+            *self._spares,
+            *self._lane_tasks,
+            *self._flush_tasks,
+            *self._hook_tasks,
+        ]
+        self._workers = []
+        self._lanes.clear()
+        self._hook_backlogs.clear()
+        self._flush_backlogs.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(self._supervisor.close(), *tasks, return_exceptions=True)
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._dropped_events += 1
+
+    def _on_coalesce_expire(self, agent_id: str) -> None:
+        assert self._coalescer is not None
+        ready = self._coalescer.pop(agent_id)
+        backlog = self._flush_backlogs.get(agent_id)
+        if backlog is not None:
+            backlog.extend(ready)
+            return
+        if not ready:
+            return
+        backlog = self._flush_backlogs[agent_id] = deque(ready)
+        task = asyncio.create_task(self._flush_coalesced(agent_id, backlog))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_coalesced(self, agent_id: str, backlog: deque[EventType]) -> None:
+        try:
+            while backlog:
+                await self._dispatch(backlog.popleft())
+        finally:
+            if self._flush_backlogs.get(agent_id) is backlog:
+                del self._flush_backlogs[agent_id]
+
+    @asynccontextmanager
+    async def blocking(self) -> AsyncIterator[None]:
+        if self._queue is None or not _in_worker.get():
+            yield
+            return
+        released = asyncio.Event()
+        spare = asyncio.create_task(self._worker(released))
+        self._spares.add(spare)
+        spare.add_done_callback(self._spares.discard)
+        try:
+            yield
+        finally:
+            released.set()
+
+    async def _enqueue(self, handler: EventHandler[Any], event: EventType) -> None:
+        assert self._queue is not None
+        if not self._workers:
+            self._start_workers()
+        try:
+            self._queue.put_nowait((handler, event))
+            return
+        except asyncio.QueueFull:
+            pass
+        if _in_worker.get():
+            await self._run_handler(handler, event)
+            return
+        if self._put_timeout is None:
+            await self._queue.put((handler, event))
+            return
+        try:
+            await asyncio.wait_for(
+                self._queue.put((handler, event)), timeout=self._put_timeout
+            )
+        except TimeoutError:
+            self._dropped_events += 1
+            self._logger.warning(
+                "[%s] Dispatch queue full, dropped %s for handler %s",
+                event.agent_id,
+                event.__class__.__name__,
+                getattr(handler, "__qualname__", handler),
             )
-        if hook is None:
+
+    def _enqueue_lane(self, handler: EventHandler[Any], event: EventType) -> None:
+        key = self.primary_agent_id(event.agent_id)
+        lane = self._lanes.get(key)
+        if lane is not None:
+            lane.append((handler, event))
+            return
+        lane = self._lanes[key] = deque([(handler, event)])
+        task = asyncio.create_task(self._drain_lane(key, lane))
+        self._lane_tasks.add(task)
+        task.add_done_callback(self._lane_tasks.discard)
+
+    async def _drain_lane(
+        self, key: str, lane: deque[tuple[EventHandler[Any], EventType]]
+    ) -> None:
+        _in_worker.set(False)
+        try:
+            while lane:
+                handler, event = lane.popleft()
+                await self._run_handler(handler, event)
+        finally:
+            if self._lanes.get(key) is lane:
+                del self._lanes[key]
+
+    def _start_workers(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self._worker_count)
+        ]
+
+    async def _worker(self, released: asyncio.Event | None = None) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        _in_worker.set(True)
+        while released is None or not released.is_set():
+            if released is None:
+                handler, event = await queue.get()
+            else:
+                get = asyncio.ensure_future(queue.get())
+                wait = asyncio.ensure_future(released.wait())
+                await asyncio.wait({get, wait}, return_when=asyncio.FIRST_COMPLETED)
+                wait.cancel()
+                if not get.done():
+                    get.cancel()
+                    return
+                handler, event = get.result()
+            try:
+                await self._run_handler(handler, event)
+            finally:
+                queue.task_done()
+
+    def _call_inline(self, handler: EventHandler[Any], event: EventType) -> None:
+        try:
+            result = handler(event)
+        except Exception as e:
+            self._handler_failed(handler, event, e)
             return
+        if result is not None and inspect.isawaitable(result):
+            key = self.primary_agent_id(event.agent_id)
+            self._supervisor.spawn(key, result, handler, event)
+
+    async def _run_handler(self, handler: EventHandler[Any], event: EventType) -> None:
+        try:
+            await handler(event)
+        except Exception as e:
+            self._handler_failed(handler, event, e)
+
+    def _handler_failed(
+        self, handler: EventHandler[Any], event: EventType, error: BaseException
+    ) -> None:
+        self._failed_handlers += 1
+        self._logger.error(
+            "[%s] Handler %s failed for %s",
+            event.agent_id,
+            getattr(handler, "__qualname__", handler),
+            event.__class__.__name__,
+            exc_info=error,
+        )
+
+    def _deliver_hook(self, hook: EventBusHook, event: EventType) -> bool:
         try:
             hook.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
         except Exception:
             self._logger.exception("Hook failed for agent %s", event.agent_id)
+        return True
+
+    def _forward_hook(self, hook: EventBusHook, event: EventType) -> None:
+        backlog = self._hook_backlogs.get(hook)
+        if backlog is not None:
+            backlog.append(event)
+            return
+        if self._deliver_hook(hook, event):
+            return
+        backlog = self._hook_backlogs[hook] = deque([event])
+        task = asyncio.create_task(self._drain_hook(hook, backlog))
+        self._hook_tasks.add(task)
+        task.add_done_callback(self._hook_tasks.discard)
+
+    async def _drain_hook(
+        self, hook: EventBusHook, backlog: deque[EventType | None]
+    ) -> None:
+        try:
+            while backlog:
+                await hook.put(backlog[0])
+                backlog.popleft()
+        finally:
+            if self._hook_backlogs.get(hook) is backlog:
+                del self._hook_backlogs[hook]
 
     def _log_event(self, event: EventType) -> None:
         if self._logger.isEnabledFor(logging.INFO):
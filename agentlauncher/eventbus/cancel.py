@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+
+
+class TokenCancelledError(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    __slots__ = ("deadline", "_reason", "_callbacks")
+
+    def __init__(self, deadline: float | None = None):
+        self.deadline = deadline
+        self._reason: str | None = None
+        self._callbacks: list[Callable[[], object]] = []
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._reason is not None or self.expired
+
+    @property
+    def reason(self) -> str | None:
+        if self._reason is None and self.expired:
+            return "Deadline exceeded"
+        return self._reason
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def cancel(self, reason: str = "Cancelled") -> None:
+        if self._reason is not None:
+            return
+        self._reason = reason
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        reason = self.reason
+        if reason is not None:
+            raise TokenCancelledError(reason)
+
+    def add_callback(self, callback: Callable[[], object]) -> None:
+        if self._reason is not None:
+            callback()
+        else:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[], object]) -> None:
+        try:
+            self._callbacks.remove(callback)
+        except ValueError:
+            pass
+
+    async def run[T](self, awaitable: Awaitable[T]) -> T:
+        if self.cancelled:
+            if isinstance(awaitable, Coroutine):
+                awaitable.close()
+            self.raise_if_cancelled()
+        task = asyncio.ensure_future(awaitable)
+        self.add_callback(task.cancel)
+        try:
+            async with asyncio.timeout(self.remaining()) as scope:
+                return await task
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            self.cancel("Deadline exceeded")
+            raise TokenCancelledError("Deadline exceeded") from None
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if (current is not None and current.cancelling()) or not self.cancelled:
+                raise
+            raise TokenCancelledError(self.reason or "Cancelled") from None
+        finally:
+            self.remove_callback(task.cancel)
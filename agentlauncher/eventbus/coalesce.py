@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Callable, Hashable
+
+from .type import DeltaEventType, EventType
+
+
+class _PendingDeltas:
+    __slots__ = ("key", "events", "size", "timer")
+
+    def __init__(self, key: Hashable, event: DeltaEventType):
+        self.key = key
+        self.events = [event]
+        self.size = event.coalesce_size
+        self.timer: asyncio.TimerHandle | None = None
+
+    def merged(self) -> DeltaEventType:
+        if self.timer is not None:
+            self.timer.cancel()
+        if len(self.events) == 1:
+            return self.events[0]
+        return type(self.events[0]).coalesce(self.events)
+
+
+class DeltaCoalescer:
+    def __init__(self, window: float = 0.05, max_size: int = 1024):
+        if window < 0:
+            raise ValueError("window must be non-negative.")
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+        self.window = window
+        self.max_size = max_size
+        self._pending: dict[str, _PendingDeltas] = {}
+        self._on_expire: Callable[[str], None] | None = None
+        self.received = 0
+        self.emitted = 0
+
+    def bind(self, on_expire: Callable[[str], None]) -> None:
+        self._on_expire = on_expire
+
+    def add(self, event: EventType) -> tuple[EventType, ...]:
+        pending = self._pending.get(event.agent_id)
+        if not isinstance(event, DeltaEventType):
+            if pending is None:
+                return (event,)
+            del self._pending[event.agent_id]
+            return self._ready(pending.merged(), event)
+
+        self.received += 1
+        key = (type(event), event.coalesce_key)
+        if pending is not None and pending.key == key:
+            pending.events.append(event)
+            pending.size += event.coalesce_size
+            if pending.size < self.max_size:
+                return ()
+            del self._pending[event.agent_id]
+            return self._ready(pending.merged())
+
+        flushed = () if pending is None else self._ready(pending.merged())
+        if event.coalesce_size >= self.max_size:
+            self._pending.pop(event.agent_id, None)
+            return flushed + self._ready(event)
+        pending = self._pending[event.agent_id] = _PendingDeltas(key, event)
+        if self._on_expire is not None:
+            pending.timer = asyncio.get_running_loop().call_later(
+                self.window, self._on_expire, event.agent_id
+            )
+        return flushed
+
+    def pop(self, agent_id: str) -> tuple[EventType, ...]:
+        pending = self._pending.pop(agent_id, None)
+        return () if pending is None else self._ready(pending.merged())
+
+    def clear(self) -> None:
+        for pending in self._pending.values():
+            if pending.timer is not None:
+                pending.timer.cancel()
+        self._pending.clear()
+
+    def _ready(self, *events: EventType) -> tuple[EventType, ...]:
+        self.emitted += sum(isinstance(e, DeltaEventType) for e in events)
+        return events
@@ -1,9 +1,26 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from .bus import EventBus
+from .cancel import CancellationToken
 
 
-@dataclass
+@dataclass(slots=True)
 class EventContext:
     agent_id: str
     event_bus: EventBus
+    cancel_token: CancellationToken = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cancel_token = self.event_bus.cancellation_token(self.agent_id)
+
+    @property
+    def deadline(self) -> float | None:
+        return self.cancel_token.deadline
+
+    @property
+    def remaining(self) -> float | None:
+        return self.cancel_token.remaining()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_token.cancelled
@@ -0,0 +1,169 @@
+import inspect
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from itertools import count
+from operator import attrgetter
+from typing import Any
+
+from .type import EventHandler, EventMatcher, EventType
+
+_sequence = count()
+
+type RouteEntry = tuple[EventHandler[Any], EventMatcher | None]
+
+
+@lru_cache(maxsize=4096)
+def _is_coroutine_function(function: Any) -> bool:
+    return inspect.iscoroutinefunction(function)
+
+
+def is_inline_handler(handler: EventHandler[Any]) -> bool:
+    try:
+        return not _is_coroutine_function(getattr(handler, "__func__", handler))
+    except TypeError:
+        return not inspect.iscoroutinefunction(handler)
+
+
+def _prefix_matcher(prefix: str) -> EventMatcher:
+    def matches(event: EventType) -> bool:
+        return event.agent_id.startswith(prefix)
+
+    return matches
+
+
+def _field_matcher(where: Mapping[str, Any]) -> EventMatcher:
+    getter = attrgetter(*where)
+    expected = tuple(where.values()) if len(where) > 1 else next(iter(where.values()))
+
+    def matches(event: EventType) -> bool:
+        try:
+            return getter(event) == expected
+        except AttributeError:
+            return False
+
+    return matches
+
+
+def compile_matcher(
+    agent_prefix: str | None = None,
+    where: Mapping[str, Any] | EventMatcher | None = None,
+) -> EventMatcher | None:
+    checks: list[EventMatcher] = []
+    if agent_prefix is not None:
+        checks.append(_prefix_matcher(agent_prefix))
+    if isinstance(where, Mapping):
+        if where:
+            checks.append(_field_matcher(where))
+    elif where is not None:
+        checks.append(where)
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    first, second = checks
+
+    def matches(event: EventType) -> bool:
+        return first(event) and second(event)
+
+    return matches
+
+
+@dataclass(frozen=True)
+class Subscription:
+    event_type: type[EventType]
+    handler: EventHandler[Any]
+    priority: int = 0
+    ordered: bool = False
+    inline: bool = False
+    remote: bool = False
+    matcher: EventMatcher | None = None
+    where_fields: frozenset[str] = frozenset()
+    sequence: int = field(default_factory=lambda: next(_sequence))
+
+    @classmethod
+    def create(
+        cls,
+        event_type: type[EventType],
+        handler: EventHandler[Any],
+        priority: int = 0,
+        ordered: bool = False,
+        remote: bool = False,
+        agent_prefix: str | None = None,
+        where: Mapping[str, Any] | EventMatcher | None = None,
+    ) -> "Subscription":
+        return cls(
+            event_type=event_type,
+            handler=handler,
+            priority=priority,
+            ordered=ordered,
+            inline=is_inline_handler(handler),
+            remote=remote,
+            matcher=compile_matcher(agent_prefix, where),
+            where_fields=(
+                frozenset(where) if isinstance(where, Mapping) else frozenset()
+            ),
+        )
+
+    def applies_to(self, event_type: type[EventType]) -> bool:
+        if not self.where_fields or not is_dataclass(event_type):
+            return True
+        return self.where_fields <= {f.name for f in fields(event_type)}
+
+
+@dataclass(frozen=True)
+class DispatchRoute:
+    inline: tuple[RouteEntry, ...] = ()
+    ordered: tuple[RouteEntry, ...] = ()
+    concurrent: tuple[RouteEntry, ...] = ()
+    remote_inline: tuple[RouteEntry, ...] = ()
+    remote_concurrent: tuple[RouteEntry, ...] = ()
+
+
+class DispatchTable(dict[type[EventType], DispatchRoute]):
+    def __init__(
+        self,
+        subscriptions: dict[type[EventType], list[Subscription]],
+        lanes_enabled: bool,
+    ):
+        super().__init__()
+        self._subscriptions = subscriptions
+        self._lanes_enabled = lanes_enabled
+
+    def __missing__(self, event_type: type[EventType]) -> DispatchRoute:
+        route = self[event_type] = self.compile(event_type)
+        return route
+
+    def compile(self, event_type: type[EventType]) -> DispatchRoute:
+        subscriptions = sorted(
+            (
+                subscription
+                for cls in event_type.__mro__
+                for subscription in self._subscriptions.get(cls, ())
+                if subscription.applies_to(event_type)
+            ),
+            key=lambda s: (-s.priority, s.sequence),
+        )
+        if not subscriptions:
+            return DispatchRoute()
+        remote = [s for s in subscriptions if s.remote]
+        subscriptions = [s for s in subscriptions if not s.remote]
+        return DispatchRoute(
+            inline=_entries(s for s in subscriptions if s.inline),
+            ordered=_entries(
+                s
+                for s in subscriptions
+                if not s.inline and s.ordered and self._lanes_enabled
+            ),
+            concurrent=_entries(
+                s
+                for s in subscriptions
+                if not s.inline and not (s.ordered and self._lanes_enabled)
+            ),
+            remote_inline=_entries(s for s in remote if s.inline),
+            remote_concurrent=_entries(s for s in remote if not s.inline),
+        )
+
+
+def _entries(subscriptions: Iterable[Subscription]) -> tuple[RouteEntry, ...]:
+    return tuple((s.handler, s.matcher) for s in subscriptions)
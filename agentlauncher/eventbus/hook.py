@@ -0,0 +1,122 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from typing import Literal
+
+from .type import DeltaEventType, EventType
+
+type HookPolicy = Literal["block", "drop_oldest", "drop_deltas"]
+
+
+class EventHookQueue:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        policy: HookPolicy = "block",
+        event_types: Iterable[type[EventType]] | None = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive.")
+        if policy not in ("block", "drop_oldest", "drop_deltas"):
+            raise ValueError(f"Unknown hook policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.event_types = tuple(event_types) if event_types is not None else None
+        self._buffer: deque[EventType] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._closed = False
+        self.received = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.max_lag = 0
+
+    @property
+    def lag(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def empty(self) -> bool:
+        return not self._buffer
+
+    def full(self) -> bool:
+        return len(self._buffer) >= self.maxsize
+
+    def close(self) -> None:
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def put_nowait(self, event: EventType | None) -> None:
+        if event is None:
+            self.close()
+            return
+        if self._closed:
+            return
+        if self.event_types is not None and not isinstance(event, self.event_types):
+            return
+        if self.full() and not self._make_room(event):
+            return
+        self._buffer.append(event)
+        self.received += 1
+        if len(self._buffer) > self.max_lag:
+            self.max_lag = len(self._buffer)
+        self._readable.set()
+
+    async def put(self, event: EventType | None) -> None:
+        while True:
+            try:
+                self.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                self._writable.clear()
+                await self._writable.wait()
+
+    def get_nowait(self) -> EventType | None:
+        if self._buffer:
+            return self._pop()
+        if self._closed:
+            return None
+        raise asyncio.QueueEmpty
+
+    async def get(self) -> EventType | None:
+        while not self._buffer:
+            if self._closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+        return self._pop()
+
+    async def __aiter__(self) -> AsyncIterator[EventType]:
+        while (event := await self.get()) is not None:
+            yield event
+
+    def _pop(self) -> EventType:
+        event = self._buffer.popleft()
+        self.consumed += 1
+        self._writable.set()
+        return event
+
+    def _make_room(self, event: EventType) -> bool:
+        if self.policy == "block":
+            raise asyncio.QueueFull
+        if self.policy == "drop_oldest":
+            self._buffer.popleft()
+            self.dropped += 1
+            return True
+        if isinstance(event, DeltaEventType):
+            self.dropped += 1
+            return False
+        for index, buffered in enumerate(self._buffer):
+            if isinstance(buffered, DeltaEventType):
+                del self._buffer[index]
+                self.dropped += 1
+                return True
+        raise asyncio.QueueFull
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from .bus import EventBus
+from .transport import EventSerializer, PickleSerializer
+from .type import EventType
+
+_RECORD = struct.Struct("<IIH")
+_SEGMENT_SUFFIX = ".seg"
+
+
+def _segment_paths(directory: Path) -> list[Path]:
+    return sorted(
+        path for path in directory.glob(f"*{_SEGMENT_SUFFIX}") if path.stem.isdigit()
+    )
+
+
+class _Segment:
+    __slots__ = ("path", "file", "map", "offset", "lock")
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.file = open(path, "w+b")
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.offset = 0
+        self.lock = threading.Lock()
+
+    def remaining(self) -> int:
+        return len(self.map) - self.offset
+
+    def write(self, agent_id: bytes, payload: bytes) -> None:
+        end = self.offset + _RECORD.size
+        _RECORD.pack_into(
+            self.map,
+            self.offset,
+            len(payload),
+            zlib.crc32(payload, zlib.crc32(agent_id)),
+            len(agent_id),
+        )
+        self.map[end : end + len(agent_id)] = agent_id
+        end += len(agent_id)
+        self.map[end : end + len(payload)] = payload
+        self.offset = end + len(payload)
+
+    def sync(self) -> None:
+        with self.lock:
+            if not self.map.closed:
+                self.map.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.map.flush()
+            self.map.close()
+        self.file.truncate(self.offset)
+        self.file.close()
+
+
+class EventJournal:
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        serializer: EventSerializer | None = None,
+        event_types: Iterable[type[EventType]] | None = None,
+        segment_size: int = 64 * 1024 * 1024,
+        sync_interval: float = 0.05,
+    ):
+        if segment_size <= _RECORD.size:
+            raise ValueError("segment_size is too small.")
+        if sync_interval < 0:
+            raise ValueError("sync_interval must be non-negative.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.serializer = serializer or PickleSerializer()
+        self.event_types = tuple(event_types) if event_types is not None else None
+        self.segment_size = segment_size
+        self.sync_interval = sync_interval
+        self._event_bus: EventBus | None = None
+        self._segment: _Segment | None = None
+        self._segment_index = max(
+            (int(path.stem) + 1 for path in _segment_paths(self.directory)),
+            default=0,
+        )
+        self._sync_handle: asyncio.TimerHandle | None = None
+        self._sync_tasks: set[asyncio.Task[None]] = set()
+        self._logger = logging.getLogger(__name__)
+        self.records = 0
+        self.syncs = 0
+
+    def attach(self, event_bus: EventBus) -> None:
+        self._event_bus = event_bus
+        for event_type in self.event_types or (EventType,):
+            event_bus.subscribe(event_type, self.append)
+
+    def append(self, event: EventType) -> None:
+        agent_id = event.agent_id
+        if self._event_bus is not None:
+            agent_id = self._event_bus.primary_agent_id(agent_id)
+        key = agent_id.encode()
+        payload = self.serializer.encode(event)
+        size = _RECORD.size + len(key) + len(payload)
+        segment = self._segment
+        if segment is None or segment.remaining() < size:
+            segment = self._rotate(size)
+        segment.write(key, payload)
+        self.records += 1
+        if self._sync_handle is None:
+            self._sync_handle = asyncio.get_running_loop().call_later(
+                self.sync_interval, self._schedule_sync
+            )
+
+    def sync(self) -> None:
+        segment = self._segment
+        if segment is not None:
+            segment.sync()
+            self.syncs += 1
+
+    async def close(self) -> None:
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        await asyncio.gather(*self._sync_tasks, return_exceptions=True)
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _rotate(self, size: int) -> _Segment:
+        if self._segment is not None:
+            self._in_thread(self._close_safely, self._segment)
+        path = self.directory / f"{self._segment_index:08d}{_SEGMENT_SUFFIX}"
+        self._segment_index += 1
+        self._segment = _Segment(path, max(self.segment_size, size))
+        return self._segment
+
+    def _schedule_sync(self) -> None:
+        self._sync_handle = None
+        self._in_thread(self._sync_safely)
+
+    def _in_thread[*A](self, function: Callable[[*A], None], *args: *A) -> None:
+        task = asyncio.create_task(asyncio.to_thread(function, *args))
+        self._sync_tasks.add(task)
+        task.add_done_callback(self._sync_tasks.discard)
+
+    def _close_safely(self, segment: _Segment) -> None:
+        try:
+            segment.close()
+        except (OSError, ValueError):
+            self._logger.exception("Journal segment close failed for %s", segment.path)
+
+    def _sync_safely(self) -> None:
+        try:
+            self.sync()
+        except (OSError, ValueError):
+            self._logger.exception("Journal sync failed for %s", self.directory)
+
+
+def read_journal(
+    directory: str | os.PathLike[str],
+    serializer: EventSerializer | None = None,
+    agent_id: str | None = None,
+) -> Iterator[EventType]:
+    serializer = serializer or PickleSerializer()
+    key = agent_id.encode() if agent_id is not None else None
+    for path in _segment_paths(Path(directory)):
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                continue
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    yield from _read_segment(view, serializer, key)
+                finally:
+                    view.release()
+
+
+def _read_segment(
+    view: memoryview, serializer: EventSerializer, key: bytes | None
+) -> Iterator[EventType]:
+    offset = 0
+    while offset + _RECORD.size <= len(view):
+        size, checksum, key_size = _RECORD.unpack_from(view, offset)
+        start = offset + _RECORD.size
+        end = start + key_size + size
+        if size == 0 or end > len(view):
+            return
+        record_key = view[start : start + key_size]
+        payload = view[start + key_size : end]
+        if zlib.crc32(payload, zlib.crc32(record_key)) != checksum:
+            return
+        offset = end
+        if key is None or record_key == key:
+            yield serializer.decode(payload)
+
+
+async def replay_journal(
+    directory: str | os.PathLike[str],
+    event_bus: EventBus,
+    agent_id: str,
+    serializer: EventSerializer | None = None,
+    event_types: Iterable[type[EventType]] | None = None,
+) -> int:
+    selected = tuple(event_types) if event_types is not None else None
+    count = 0
+    for event in read_journal(directory, serializer, agent_id):
+        if selected is not None and not isinstance(event, selected):
+            continue
+        await event_bus.receive_observed_event(agent_id, event)
+        count += 1
+    return count
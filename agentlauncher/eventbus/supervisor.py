@@ -0,0 +1,90 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from .type import EventHandler, EventType
+
+type FailureCallback = Callable[[EventHandler[Any], EventType, BaseException], None]
+
+
+class TaskSupervisor:
+    def __init__(self, on_failure: FailureCallback):
+        self._on_failure = on_failure
+        self._groups: dict[str, dict[asyncio.Future[Any], EventType]] = {}
+        self._in_flight = 0
+        self._leaked = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def leaked(self) -> int:
+        return self._leaked
+
+    @property
+    def group_count(self) -> int:
+        return len(self._groups)
+
+    def in_flight_for(self, key: str) -> int:
+        return len(self._groups.get(key, ()))
+
+    def spawn(
+        self,
+        key: str,
+        awaitable: Awaitable[Any],
+        handler: EventHandler[Any],
+        event: EventType,
+    ) -> asyncio.Future[Any]:
+        task = asyncio.ensure_future(awaitable)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {}
+        group[task] = event
+        self._in_flight += 1
+        task.add_done_callback(partial(self._finished, key, handler, event))
+        return task
+
+    def cancel(self, key: str, keep: tuple[type[EventType], ...] = ()) -> int:
+        group = self._groups.get(key)
+        if not group:
+            return 0
+        current = asyncio.current_task()
+        cancelled = 0
+        for task, event in list(group.items()):
+            if task is current or task.done() or isinstance(event, keep):
+                continue
+            del group[task]
+            task.cancel()
+            cancelled += 1
+        if not group:
+            del self._groups[key]
+        self._leaked += cancelled
+        return cancelled
+
+    async def close(self) -> None:
+        tasks = [task for group in self._groups.values() for task in group]
+        self._groups.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _finished(
+        self,
+        key: str,
+        handler: EventHandler[Any],
+        event: EventType,
+        task: asyncio.Future[Any],
+    ) -> None:
+        self._in_flight -= 1
+        group = self._groups.get(key)
+        if group is not None:
+            group.pop(task, None)
+            if not group:
+                del self._groups[key]
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self._on_failure(handler, event, exc)
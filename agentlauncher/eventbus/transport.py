@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import pickle
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from agentlauncher.shared import get_primary_agent_id
+
+from .type import EventType
+
+if TYPE_CHECKING:
+    from .bus import EventBus
+
+_HEADER = struct.Struct("!I")
+
+type Frame = tuple[str, str, Any]
+
+
+def partition_of(agent_id: str, partition_count: int) -> int:
+    try:
+        agent_id = get_primary_agent_id(agent_id)
+    except ValueError:
+        pass
+    return zlib.crc32(agent_id.encode()) % partition_count
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Frame:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def write_frame(
+    writer: asyncio.StreamWriter, kind: str, key: str, payload: Any
+) -> None:
+    body = pickle.dumps((kind, key, payload), protocol=pickle.HIGHEST_PROTOCOL)
+    writer.writelines((_HEADER.pack(len(body)), body))
+
+
+class EventSerializer(ABC):
+    @abstractmethod
+    def encode(self, event: EventType) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> EventType: ...
+
+
+class PickleSerializer(EventSerializer):
+    def encode(self, event: EventType) -> bytes:
+        return pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> EventType:
+        return pickle.loads(data)
+
+
+class EventTransport(ABC):
+    @abstractmethod
+    async def start(self, event_bus: "EventBus") -> None: ...
+
+    @abstractmethod
+    def owns(self, primary_agent_id: str) -> bool: ...
+
+    @abstractmethod
+    async def send(self, primary_agent_id: str, event: EventType) -> None: ...
+
+    @abstractmethod
+    async def publish(self, primary_agent_id: str, event: EventType) -> None: ...
+
+    @abstractmethod
+    async def watch(self, primary_agent_id: str) -> None: ...
+
+    @abstractmethod
+    async def unwatch(self, primary_agent_id: str) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class EventBroker:
+    def __init__(self, path: str, partition_count: int, high_water: int = 1 << 20):
+        if partition_count <= 0:
+            raise ValueError("partition_count must be positive.")
+        if high_water <= 0:
+            raise ValueError("high_water must be positive.")
+        self.path = path
+        self.partition_count = partition_count
+        self.high_water = high_water
+        self._owners: dict[int, asyncio.StreamWriter] = {}
+        self._watchers: dict[str, set[asyncio.StreamWriter]] = {}
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+        self._owned = asyncio.Event()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def owned_partitions(self) -> frozenset[int]:
+        return frozenset(self._owners)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def wait_until_owned(self) -> None:
+        await self._owned.wait()
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        writer.transport.set_write_buffer_limits(high=self.high_water)
+        try:
+            while True:
+                try:
+                    kind, key, payload = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception:
+                    self._logger.exception("Dropped an unreadable frame")
+                    continue
+                peers = self._route(writer, kind, key, payload)
+                for peer in peers:
+                    await self._drain(peer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            self._disconnect(writer)
+            writer.close()
+
+    async def _drain(self, peer: asyncio.StreamWriter) -> None:
+        try:
+            await peer.drain()
+        except ConnectionError:
+            pass
+
+    def _route(
+        self, writer: asyncio.StreamWriter, kind: str, key: str, payload: Any
+    ) -> tuple[asyncio.StreamWriter, ...]:
+        if kind == "hello":
+            for partition in payload:
+                self._owners[partition % self.partition_count] = writer
+            if len(self._owners) == self.partition_count:
+                self._owned.set()
+        elif kind == "event":
+            return self._forward_to_owner(kind, key, payload)
+        elif kind == "observe":
+            watchers = tuple(self._watchers.get(key, ()))
+            for watcher in watchers:
+                write_frame(watcher, kind, key, payload)
+            return watchers
+        elif kind == "watch":
+            watchers = self._watchers.setdefault(key, set())
+            forwarded = () if watchers else self._forward_to_owner(kind, key, None)
+            watchers.add(writer)
+            return forwarded
+        elif kind == "unwatch":
+            return self._drop_watcher(key, writer)
+        return ()
+
+    def _forward_to_owner(
+        self, kind: str, key: str, payload: Any
+    ) -> tuple[asyncio.StreamWriter, ...]:
+        owner = self._owners.get(partition_of(key, self.partition_count))
+        if owner is None:
+            self._logger.warning(
+                "[%s] No process owns this agent, dropped %s", key, kind
+            )
+            return ()
+        write_frame(owner, kind, key, payload)
+        return (owner,)
+
+    def _drop_watcher(
+        self, key: str, writer: asyncio.StreamWriter
+    ) -> tuple[asyncio.StreamWriter, ...]:
+        watchers = self._watchers.get(key)
+        if watchers is None:
+            return ()
+        watchers.discard(writer)
+        if watchers:
+            return ()
+        del self._watchers[key]
+        return self._forward_to_owner("unwatch", key, None)
+
+    def _disconnect(self, writer: asyncio.StreamWriter) -> None:
+        for partition, owner in list(self._owners.items()):
+            if owner is writer:
+                del self._owners[partition]
+                self._owned.clear()
+        for key in [k for k, w in self._watchers.items() if writer in w]:
+            self._drop_watcher(key, writer)
+
+
+class UnixSocketTransport(EventTransport):
+    def __init__(
+        self,
+        path: str,
+        partitions: Iterable[int],
+        partition_count: int,
+        serializer: EventSerializer | None = None,
+    ):
+        if partition_count <= 0:
+            raise ValueError("partition_count must be positive.")
+        self.path = path
+        self.partitions = frozenset(p % partition_count for p in partitions)
+        self.partition_count = partition_count
+        self.serializer = serializer or PickleSerializer()
+        self._event_bus: EventBus | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._watching: dict[str, int] = {}
+        self._watched: set[str] = set()
+        self._logger = logging.getLogger(__name__)
+
+    async def start(self, event_bus: "EventBus") -> None:
+        if self._writer is not None:
+            return
+        self._event_bus = event_bus
+        reader, self._writer = await asyncio.open_unix_connection(self.path)
+        write_frame(self._writer, "hello", "", sorted(self.partitions))
+        await self._writer.drain()
+        self._reader_task = asyncio.create_task(self._read(reader))
+
+    def owns(self, primary_agent_id: str) -> bool:
+        return partition_of(primary_agent_id, self.partition_count) in self.partitions
+
+    async def send(self, primary_agent_id: str, event: EventType) -> None:
+        await self._write("event", primary_agent_id, event)
+
+    async def publish(self, primary_agent_id: str, event: EventType) -> None:
+        if primary_agent_id in self._watched:
+            await self._write("observe", primary_agent_id, event)
+
+    async def watch(self, primary_agent_id: str) -> None:
+        count = self._watching.get(primary_agent_id, 0)
+        self._watching[primary_agent_id] = count + 1
+        if count == 0:
+            await self._write("watch", primary_agent_id, None)
+
+    async def unwatch(self, primary_agent_id: str) -> None:
+        count = self._watching.get(primary_agent_id, 0)
+        if count <= 1:
+            self._watching.pop(primary_agent_id, None)
+            if count == 1:
+                await self._write("unwatch", primary_agent_id, None)
+        else:
+            self._watching[primary_agent_id] = count - 1
+
+    async def wait_closed(self) -> None:
+        if self._reader_task is not None:
+            await asyncio.shield(self._reader_task)
+
+    async def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def _write(self, kind: str, key: str, event: EventType | None) -> None:
+        if self._writer is None:
+            raise RuntimeError("Transport is not started.")
+        payload = None if event is None else self.serializer.encode(event)
+        write_frame(self._writer, kind, key, payload)
+        await self._writer.drain()
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        assert self._event_bus is not None
+        try:
+            while True:
+                try:
+                    await self._receive(*await read_frame(reader))
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception:
+                    self._logger.exception("Failed to handle a frame from the broker")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self._logger.warning("Event broker connection closed")
+
+    async def _receive(self, kind: str, key: str, payload: Any) -> None:
+        assert self._event_bus is not None
+        if kind == "watch":
+            self._watched.add(key)
+        elif kind == "unwatch":
+            self._watched.discard(key)
+        elif kind == "event":
+            await self._event_bus.receive_event(self.serializer.decode(payload))
+        elif kind == "observe":
+            await self._event_bus.receive_observed_event(
+                key, self.serializer.decode(payload)
+            )
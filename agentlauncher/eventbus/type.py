@@ -1,15 +1,70 @@
 import asyncio
-from abc import ABC
-from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
-from typing import Any, TypeVar
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from dataclasses import dataclass, field, fields
+from functools import cache
+from typing import TYPE_CHECKING, Any, Self, TypeVar
 
+if TYPE_CHECKING:
+    from .hook import EventHookQueue
 
-@dataclass
+
+MONOTONIC = "monotonic"
+
+
+def deadline_field() -> Any:
+    return field(default=None, metadata={MONOTONIC: True})
+
+
+@cache
+def monotonic_fields(cls: type) -> frozenset[str]:
+    return frozenset(f.name for f in fields(cls) if f.metadata.get(MONOTONIC))
+
+
+@cache
+def _state_fields(cls: type) -> tuple[tuple[str, bool], ...]:
+    relative = monotonic_fields(cls)
+    return tuple((f.name, f.name in relative) for f in fields(cls))
+
+
+@dataclass(slots=True)
 class EventType(ABC):
     agent_id: str
 
+    def __getstate__(self) -> dict[str, Any]:
+        now = time.monotonic()
+        state: dict[str, Any] = {}
+        for name, relative in _state_fields(type(self)):
+            value = getattr(self, name)
+            state[name] = value - now if relative and value is not None else value
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        now = time.monotonic()
+        for name, relative in _state_fields(type(self)):
+            value = state[name]
+            if relative and value is not None:
+                value += now
+            object.__setattr__(self, name, value)
+
+
+@dataclass(slots=True)
+class DeltaEventType(EventType):
+    @property
+    @abstractmethod
+    def coalesce_key(self) -> Hashable: ...
+
+    @property
+    @abstractmethod
+    def coalesce_size(self) -> int: ...
+
+    @classmethod
+    @abstractmethod
+    def coalesce(cls, events: Sequence[Self]) -> Self: ...
+
 
 T = TypeVar("T", bound=EventType)
-type EventHandler[T] = Callable[[T], Coroutine[Any, Any, None]]
-type EventBusHook = asyncio.Queue[EventType | None]
+type EventHandler[T] = Callable[[T], Coroutine[Any, Any, None] | None]
+type EventMatcher = Callable[[EventType], bool]
+type EventBusHook = asyncio.Queue[EventType | None] | EventHookQueue
@@ -1,3 +1,7 @@
+from typing import TYPE_CHECKING
+
+from agentlauncher.shared import lazy_exports
+
 from .agent import (
     AgentConversationProcessedEvent,
     AgentCreateEvent,
@@ -24,6 +28,8 @@ from .message import (
 )
 from .task import TaskCancelEvent, TaskCreateEvent, TaskFinishEvent
 from .tool import (
+    FrozenToolCall,
+    FrozenToolResult,
     ToolCall,
     ToolExecErrorEvent,
     ToolExecFinishEvent,
@@ -33,8 +39,15 @@ from .tool import (
     ToolsExecRequestEvent,
     ToolsExecResultsEvent,
 )
+from .usage import TaskUsageEvent, TokenBudgetExceededEvent
+
+if TYPE_CHECKING:
+    from .codec import EventCodec
+
+__getattr__ = lazy_exports(__name__, {"EventCodec": ".codec"})
 
 __all__ = [
+    "EventCodec",
     "LLMRequestEvent",
     "LLMResponseEvent",
     "LLMRuntimeErrorEvent",
@@ -47,6 +60,8 @@ __all__ = [
     "ToolsExecResultsEvent",
     "ToolResult",
     "ToolCall",
+    "FrozenToolResult",
+    "FrozenToolCall",
     "ToolRuntimeErrorEvent",
     "ToolExecStartEvent",
     "ToolExecFinishEvent",
@@ -67,4 +82,6 @@ __all__ = [
     "AgentLauncherShutdownEvent",
     "AgentLauncherRunEvent",
     "AgentLauncherStopEvent",
+    "TokenBudgetExceededEvent",
+    "TaskUsageEvent",
 ]
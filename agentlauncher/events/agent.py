@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 from agentlauncher.eventbus import EventType
@@ -7,7 +8,7 @@ from agentlauncher.llm_interface import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentCreateEvent(EventType):
     task: str
     tool_schemas: list[ToolSchema]
@@ -15,25 +16,25 @@ class AgentCreateEvent(EventType):
     system_prompt: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStartEvent(EventType): ...
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentFinishEvent(EventType):
     result: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentRuntimeErrorEvent(EventType):
     error: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentDeletedEvent(EventType): ...
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConversationProcessedEvent(EventType):
-    original_messages: list[Message]
-    processed_messages: list[Message]
+    original_messages: Sequence[Message]
+    processed_messages: Sequence[Message]
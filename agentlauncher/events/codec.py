@@ -0,0 +1,421 @@
+import struct
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any
+
+from agentlauncher.eventbus import EventSerializer, EventType
+from agentlauncher.eventbus.type import monotonic_fields
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    FrozenToolParamSchema,
+    MessageView,
+    SystemMessage,
+    ToolCallMessage,
+    ToolParamSchema,
+    ToolResultMessage,
+    ToolSchema,
+    UserMessage,
+)
+from agentlauncher.shared import AgentId
+
+from .agent import (
+    AgentConversationProcessedEvent,
+    AgentCreateEvent,
+    AgentDeletedEvent,
+    AgentFinishEvent,
+    AgentRuntimeErrorEvent,
+    AgentStartEvent,
+)
+from .launcher import (
+    AgentLauncherRunEvent,
+    AgentLauncherShutdownEvent,
+    AgentLauncherStopEvent,
+)
+from .llm import LLMRequestEvent, LLMResponseEvent, LLMRuntimeErrorEvent
+from .message import (
+    MessageDeltaStreamingEvent,
+    MessageDoneStreamingEvent,
+    MessagesAddEvent,
+    MessageStartStreamingEvent,
+    ToolCallArgumentsDeltaStreamingEvent,
+    ToolCallArgumentsDoneStreamingEvent,
+    ToolCallArgumentsStartStreamingEvent,
+    ToolCallNameStreamingEvent,
+)
+from .task import TaskCancelEvent, TaskCreateEvent, TaskFinishEvent
+from .tool import (
+    FrozenToolCall,
+    FrozenToolResult,
+    ToolCall,
+    ToolExecErrorEvent,
+    ToolExecFinishEvent,
+    ToolExecStartEvent,
+    ToolResult,
+    ToolRuntimeErrorEvent,
+    ToolsExecRequestEvent,
+    ToolsExecResultsEvent,
+)
+from .usage import TaskUsageEvent, TokenBudgetExceededEvent
+
+CUSTOM_TYPE_ID_START = 256
+
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_LIST = 7
+_TUPLE = 8
+_DICT = 9
+_OBJECT = 10
+_AGENT_ID = 11
+
+_DOUBLE = struct.Struct("<d")
+
+BUILTIN_TYPES: tuple[type, ...] = (
+    UserMessage,
+    SystemMessage,
+    AssistantMessage,
+    ToolCallMessage,
+    ToolResultMessage,
+    ToolParamSchema,
+    ToolSchema,
+    ToolCall,
+    ToolResult,
+    AgentCreateEvent,
+    AgentStartEvent,
+    AgentFinishEvent,
+    AgentRuntimeErrorEvent,
+    AgentDeletedEvent,
+    AgentConversationProcessedEvent,
+    AgentLauncherRunEvent,
+    AgentLauncherStopEvent,
+    AgentLauncherShutdownEvent,
+    LLMRequestEvent,
+    LLMResponseEvent,
+    LLMRuntimeErrorEvent,
+    MessagesAddEvent,
+    MessageStartStreamingEvent,
+    MessageDeltaStreamingEvent,
+    MessageDoneStreamingEvent,
+    ToolCallNameStreamingEvent,
+    ToolCallArgumentsStartStreamingEvent,
+    ToolCallArgumentsDeltaStreamingEvent,
+    ToolCallArgumentsDoneStreamingEvent,
+    TaskCreateEvent,
+    TaskFinishEvent,
+    TaskCancelEvent,
+    ToolsExecRequestEvent,
+    ToolsExecResultsEvent,
+    ToolRuntimeErrorEvent,
+    ToolExecStartEvent,
+    ToolExecFinishEvent,
+    ToolExecErrorEvent,
+    TokenBudgetExceededEvent,
+    TaskUsageEvent,
+    FrozenToolParamSchema,
+    FrozenToolCall,
+    FrozenToolResult,
+)
+
+
+@dataclass(frozen=True)
+class CodecLayout:
+    cls: type
+    type_id: int
+    fields: tuple[str, ...]
+    monotonic: frozenset[str] = frozenset()
+
+
+def _write_uvarint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_uvarint(view: memoryview, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = view[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_str(out: bytearray, value: str) -> None:
+    data = value.encode()
+    size = len(data)
+    if size < 0x80:
+        out.append(_STR)
+        out.append(size)
+    else:
+        out.append(_STR)
+        _write_uvarint(out, size)
+    out += data
+
+
+class EventCodec(EventSerializer):
+    def __init__(self, builtins: bool = True):
+        self._layouts: dict[type, CodecLayout] = {}
+        self._by_id: dict[int, CodecLayout] = {}
+        self._encoders: dict[type, Callable[[bytearray, Any], None]] = {
+            str: _encode_str,
+            AgentId: self._encode_agent_id,
+            type(None): self._encode_none,
+            bool: self._encode_bool,
+            int: self._encode_int,
+            float: self._encode_float,
+            list: self._encode_list,
+            tuple: self._encode_list,
+            MessageView: self._encode_list,
+            dict: self._encode_dict,
+            bytes: self._encode_bytes,
+            bytearray: self._encode_bytes,
+            memoryview: self._encode_bytes,
+        }
+        self._decoders: tuple[Callable[[memoryview, int], tuple[Any, int]], ...] = (
+            self._decode_none,
+            self._decode_false,
+            self._decode_true,
+            self._decode_int,
+            self._decode_float,
+            self._decode_str,
+            self._decode_bytes,
+            self._decode_list,
+            self._decode_tuple,
+            self._decode_dict,
+            self._decode_object,
+            self._decode_agent_id,
+        )
+        if builtins:
+            for type_id, cls in enumerate(BUILTIN_TYPES, start=1):
+                self._add(cls, type_id)
+
+    def register[C: type](self, cls: C, type_id: int) -> C:
+        if type_id < CUSTOM_TYPE_ID_START:
+            raise ValueError(
+                f"Custom type ids must be >= {CUSTOM_TYPE_ID_START}, got {type_id}."
+            )
+        self._add(cls, type_id)
+        return cls
+
+    def layout(self, cls: type) -> CodecLayout:
+        layout = self._layouts.get(cls)
+        if layout is not None:
+            return layout
+        for base in cls.__mro__[1:]:
+            layout = self._layouts.get(base)
+            if layout is not None:
+                self._bind(cls, layout)
+                return layout
+        raise TypeError(f"No codec layout registered for {cls.__name__}.")
+
+    def encode(self, event: EventType) -> bytes:
+        out = bytearray()
+        self._encode(out, event)
+        return bytes(out)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        with memoryview(data) as view:
+            try:
+                value, pos = self._decode(view, 0)
+            except IndexError as e:
+                raise ValueError("Truncated or corrupt codec payload.") from e
+            if pos != len(view):
+                raise ValueError(f"Trailing data after decoded value at offset {pos}.")
+        return value
+
+    def _add(self, cls: type, type_id: int) -> None:
+        if not is_dataclass(cls):
+            raise TypeError(f"{cls.__name__} is not a dataclass.")
+        if type_id in self._by_id or cls in self._layouts:
+            raise ValueError(f"{cls.__name__} or type id {type_id} already registered.")
+        layout = CodecLayout(
+            cls=cls,
+            type_id=type_id,
+            fields=tuple(f.name for f in fields(cls) if f.init),
+            monotonic=monotonic_fields(cls),
+        )
+        self._by_id[type_id] = layout
+        self._bind(cls, layout)
+
+    def _bind(self, cls: type, layout: CodecLayout) -> None:
+        header = bytearray((_OBJECT,))
+        _write_uvarint(header, layout.type_id)
+        prefix = bytes(header)
+        names = layout.fields
+        relative = layout.monotonic
+        encoders = self._encoders
+
+        def encode_object(out: bytearray, value: Any) -> None:
+            out += prefix
+            for name in names:
+                item = getattr(value, name)
+                if relative and item is not None and name in relative:
+                    item -= time.monotonic()
+                if type(item) is str:
+                    _encode_str(out, item)
+                else:
+                    (encoders.get(type(item)) or self._fallback)(out, item)
+
+        self._layouts[cls] = layout
+        self._encoders[cls] = encode_object
+
+    def _encode(self, out: bytearray, value: Any) -> None:
+        (self._encoders.get(type(value)) or self._fallback)(out, value)
+
+    def _fallback(self, out: bytearray, value: Any) -> None:
+        cls = type(value)
+        for base, encoder in (
+            (str, _encode_str),
+            (int, self._encode_int),
+            (float, self._encode_float),
+            (list | tuple, self._encode_list),
+            (dict, self._encode_dict),
+        ):
+            if isinstance(value, base):
+                encoder(out, value)
+                return
+        self.layout(cls)
+        self._encoders[cls](out, value)
+
+    def _encode_none(self, out: bytearray, value: None) -> None:
+        out.append(_NONE)
+
+    def _encode_agent_id(self, out: bytearray, value: AgentId) -> None:
+        out.append(_AGENT_ID)
+        _encode_str(out, value)
+
+    def _encode_bool(self, out: bytearray, value: bool) -> None:
+        out.append(_TRUE if value else _FALSE)
+
+    def _encode_int(self, out: bytearray, value: int) -> None:
+        out.append(_INT)
+        _write_uvarint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+    def _encode_float(self, out: bytearray, value: float) -> None:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+
+    def _encode_bytes(self, out: bytearray, value: bytes) -> None:
+        out.append(_BYTES)
+        _write_uvarint(out, len(value))
+        out += value
+
+    def _encode_list(self, out: bytearray, value: Sequence[Any]) -> None:
+        out.append(_TUPLE if isinstance(value, tuple) else _LIST)
+        _write_uvarint(out, len(value))
+        encoders = self._encoders
+        for item in value:
+            if type(item) is str:
+                _encode_str(out, item)
+            else:
+                (encoders.get(type(item)) or self._fallback)(out, item)
+
+    def _encode_dict(self, out: bytearray, value: dict[Any, Any]) -> None:
+        out.append(_DICT)
+        _write_uvarint(out, len(value))
+        encoders = self._encoders
+        for key, item in value.items():
+            if type(key) is str:
+                _encode_str(out, key)
+            else:
+                (encoders.get(type(key)) or self._fallback)(out, key)
+            if type(item) is str:
+                _encode_str(out, item)
+            else:
+                (encoders.get(type(item)) or self._fallback)(out, item)
+
+    def _decode(self, view: memoryview, pos: int) -> tuple[Any, int]:
+        tag = view[pos]
+        if tag > _AGENT_ID:
+            raise ValueError(f"Unknown codec tag {tag} at offset {pos}.")
+        return self._decoders[tag](view, pos + 1)
+
+    def _decode_none(self, view: memoryview, pos: int) -> tuple[None, int]:
+        return None, pos
+
+    def _decode_false(self, view: memoryview, pos: int) -> tuple[bool, int]:
+        return False, pos
+
+    def _decode_true(self, view: memoryview, pos: int) -> tuple[bool, int]:
+        return True, pos
+
+    def _decode_int(self, view: memoryview, pos: int) -> tuple[int, int]:
+        value, pos = _read_uvarint(view, pos)
+        return (value >> 1) ^ -(value & 1), pos
+
+    def _decode_float(self, view: memoryview, pos: int) -> tuple[float, int]:
+        return _DOUBLE.unpack_from(view, pos)[0], pos + _DOUBLE.size
+
+    def _decode_str(self, view: memoryview, pos: int) -> tuple[str, int]:
+        size = view[pos]
+        if size < 0x80:
+            pos += 1
+        else:
+            size, pos = _read_uvarint(view, pos)
+        end = pos + size
+        return str(view[pos:end], "utf-8"), end
+
+    def _decode_bytes(self, view: memoryview, pos: int) -> tuple[bytes, int]:
+        size, pos = _read_uvarint(view, pos)
+        return bytes(view[pos : pos + size]), pos + size
+
+    def _decode_items(self, view: memoryview, pos: int) -> tuple[list[Any], int]:
+        size, pos = _read_uvarint(view, pos)
+        return self._decode_values(view, pos, size)
+
+    def _decode_list(self, view: memoryview, pos: int) -> tuple[list[Any], int]:
+        return self._decode_items(view, pos)
+
+    def _decode_tuple(self, view: memoryview, pos: int) -> tuple[tuple[Any, ...], int]:
+        items, pos = self._decode_items(view, pos)
+        return tuple(items), pos
+
+    def _decode_dict(self, view: memoryview, pos: int) -> tuple[dict[Any, Any], int]:
+        size, pos = _read_uvarint(view, pos)
+        items, pos = self._decode_values(view, pos, size * 2)
+        return dict(zip(items[::2], items[1::2], strict=True)), pos
+
+    def _decode_object(self, view: memoryview, pos: int) -> tuple[Any, int]:
+        type_id, pos = _read_uvarint(view, pos)
+        layout = self._by_id.get(type_id)
+        if layout is None:
+            raise ValueError(f"Unknown codec type id {type_id}.")
+        values, pos = self._decode_values(view, pos, len(layout.fields))
+        kwargs = dict(zip(layout.fields, values, strict=True))
+        for name in layout.monotonic:
+            if kwargs[name] is not None:
+                kwargs[name] += time.monotonic()
+        return layout.cls(**kwargs), pos
+
+    def _decode_agent_id(self, view: memoryview, pos: int) -> tuple[AgentId, int]:
+        value, pos = self._decode_str(view, pos + 1)
+        return AgentId.of(value), pos
+
+    def _decode_values(
+        self, view: memoryview, pos: int, count: int
+    ) -> tuple[list[Any], int]:
+        decoders = self._decoders
+        values: list[Any] = []
+        append = values.append
+        for _ in range(count):
+            tag = view[pos]
+            if tag == _STR and view[pos + 1] < 0x80:
+                end = pos + 2 + view[pos + 1]
+                append(str(view[pos + 2 : end], "utf-8"))
+                pos = end
+            elif tag == _INT and view[pos + 1] < 0x80:
+                value = view[pos + 1]
+                append((value >> 1) ^ -(value & 1))
+                pos += 2
+            else:
+                value, pos = decoders[tag](view, pos + 1)
+                append(value)
+        return values, pos
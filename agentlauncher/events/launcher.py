@@ -3,16 +3,16 @@ from dataclasses import dataclass
 from agentlauncher.eventbus import EventType
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentLauncherRunEvent(EventType):
     task: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentLauncherStopEvent(EventType):
     result: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentLauncherShutdownEvent(EventType):
     pass
@@ -1,7 +1,7 @@
 from collections.abc import Sequence
 from dataclasses import dataclass
 
-from agentlauncher.eventbus import EventType
+from agentlauncher.eventbus import EventType, deadline_field
 from agentlauncher.llm_interface import (
     AssistantMessage,
     Message,
@@ -10,20 +10,21 @@ from agentlauncher.llm_interface import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMRequestEvent(EventType):
-    messages: list[Message]
+    messages: Sequence[Message]
     tool_schemas: list[ToolSchema]
     retry_count: int = 0
+    deadline: float | None = deadline_field()
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponseEvent(EventType):
     request_event: LLMRequestEvent
     response: Sequence[AssistantMessage | ToolCallMessage]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMRuntimeErrorEvent(EventType):
     error: str
     request_event: LLMRequestEvent
@@ -1,49 +1,81 @@
-from collections.abc import Sequence
+from collections.abc import Hashable, Sequence
 from dataclasses import dataclass
+from typing import Self
 
-from agentlauncher.eventbus import EventType
+from agentlauncher.eventbus import DeltaEventType, EventType
 from agentlauncher.llm_interface import (
     Message,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class MessagesAddEvent(EventType):
     messages: Sequence[Message]
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageStartStreamingEvent(EventType): ...
 
 
-@dataclass
-class MessageDeltaStreamingEvent(EventType):
+@dataclass(slots=True)
+class MessageDeltaStreamingEvent(DeltaEventType):
     delta: str
 
+    @property
+    def coalesce_key(self) -> Hashable:
+        return None
 
-@dataclass
+    @property
+    def coalesce_size(self) -> int:
+        return len(self.delta)
+
+    @classmethod
+    def coalesce(cls, events: Sequence[Self]) -> Self:
+        return cls(
+            agent_id=events[0].agent_id,
+            delta="".join(event.delta for event in events),
+        )
+
+
+@dataclass(slots=True)
 class MessageDoneStreamingEvent(EventType):
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallNameStreamingEvent(EventType):
     tool_call_id: str
     tool_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallArgumentsStartStreamingEvent(EventType):
     tool_call_id: str
 
 
-@dataclass
-class ToolCallArgumentsDeltaStreamingEvent(EventType):
+@dataclass(slots=True)
+class ToolCallArgumentsDeltaStreamingEvent(DeltaEventType):
     tool_call_id: str
     arguments_delta: str
 
+    @property
+    def coalesce_key(self) -> Hashable:
+        return self.tool_call_id
+
+    @property
+    def coalesce_size(self) -> int:
+        return len(self.arguments_delta)
+
+    @classmethod
+    def coalesce(cls, events: Sequence[Self]) -> Self:
+        return cls(
+            agent_id=events[0].agent_id,
+            tool_call_id=events[0].tool_call_id,
+            arguments_delta="".join(event.arguments_delta for event in events),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallArgumentsDoneStreamingEvent(EventType):
     tool_call_id: str
     arguments: str
@@ -1,23 +1,26 @@
 from dataclasses import dataclass
 
-from agentlauncher.eventbus import EventType
+from agentlauncher.eventbus import EventType, deadline_field
 from agentlauncher.llm_interface import (
     ToolSchema,
 )
+from agentlauncher.session import SessionContext
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskCreateEvent(EventType):
     task: str
     tool_schemas: list[ToolSchema]
     system_prompt: str | None = None
+    session_context: SessionContext | None = None
+    deadline: float | None = deadline_field()
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskFinishEvent(EventType):
     result: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskCancelEvent(EventType):
     reason: str | None = None
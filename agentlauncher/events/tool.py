@@ -1,53 +1,68 @@
 from dataclasses import dataclass
 from typing import Any
 
-from agentlauncher.eventbus import EventType
+from agentlauncher.eventbus import EventType, deadline_field
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     tool_call_id: str
     tool_name: str
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class FrozenToolCall:
+    tool_call_id: str
+    tool_name: str
+    arguments: dict[str, Any]
+
+
+@dataclass(slots=True)
 class ToolsExecRequestEvent(EventType):
-    tool_calls: list[ToolCall]
+    tool_calls: list[ToolCall | FrozenToolCall]
+    deadline: float | None = deadline_field()
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     tool_call_id: str
     tool_name: str
     result: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class FrozenToolResult:
+    tool_call_id: str
+    tool_name: str
+    result: str
+
+
+@dataclass(slots=True)
 class ToolsExecResultsEvent(EventType):
-    tool_results: list[ToolResult]
+    tool_results: list[ToolResult | FrozenToolResult]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolRuntimeErrorEvent(EventType):
     error: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolExecStartEvent(EventType):
     tool_call_id: str
     tool_name: str
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolExecFinishEvent(EventType):
     tool_call_id: str
     tool_name: str
     result: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolExecErrorEvent(EventType):
     tool_call_id: str
     tool_name: str
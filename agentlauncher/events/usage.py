@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+from agentlauncher.eventbus import EventType
+
+
+@dataclass(slots=True)
+class TokenBudgetExceededEvent(EventType):
+    reason: str
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+
+
+@dataclass(slots=True)
+class TaskUsageEvent(EventType):
+    prompt_tokens: int
+    completion_tokens: int
+    requests: int
+    cost: float
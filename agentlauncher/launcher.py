@@ -1,15 +1,33 @@
 import asyncio
 import inspect
-from typing import Any
+import os
+import time
+from collections import deque
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from agentlauncher.eventbus import (
     EventBus,
     EventBusHook,
     EventContext,
     EventHandler,
+    EventHookQueue,
+    EventMatcher,
     EventType,
+    HookPolicy,
 )
 from agentlauncher.events import (
+    AgentDeletedEvent,
+    AgentFinishEvent,
     AgentLauncherRunEvent,
     AgentLauncherShutdownEvent,
     AgentLauncherStopEvent,
@@ -17,20 +35,224 @@ from agentlauncher.events import (
     TaskCreateEvent,
     TaskFinishEvent,
 )
-from agentlauncher.llm_interface import ToolParamSchema
+from agentlauncher.llm_interface import TokenEstimator, ToolParamSchema
 from agentlauncher.llm_interface.message import Message
 from agentlauncher.runtimes import (
     AgentRuntime,
+    ConversationProcessor,
     LLMRuntime,
+    RecordedResponses,
     RuntimeType,
+    TokenBudget,
     ToolRuntime,
+    TurnSummarizer,
+    UsageRuntime,
 )
 from agentlauncher.session import (
     ConversationSession,
     InMemoryConversationSession,
     SessionContext,
 )
-from agentlauncher.shared import PRIMARY_AGENT_SYSTEM_PROMPT, generate_primary_agent_id
+from agentlauncher.shared import (
+    PRIMARY_AGENT_SYSTEM_PROMPT,
+    generate_primary_agent_id,
+    install_event_loop_policy,
+)
+
+if TYPE_CHECKING:
+    from agentlauncher.eventbus import EventSerializer
+    from agentlauncher.scheduler import AdmissionScheduler
+
+type EventSubscription = tuple[type[EventType], EventHandler[Any], dict[str, Any]]
+
+install_event_loop_policy()
+
+TASK_CLEANUP_EVENTS: tuple[type[EventType], ...] = (
+    AgentFinishEvent,
+    AgentDeletedEvent,
+    TaskFinishEvent,
+    TaskCancelEvent,
+    AgentLauncherStopEvent,
+    AgentLauncherShutdownEvent,
+)
+
+
+class TaskStream:
+    def __init__(
+        self,
+        launcher: "AgentLauncher",
+        agent_id: str,
+        buffer: EventHookQueue,
+        run: Coroutine[Any, Any, str | None],
+    ):
+        self.agent_id = agent_id
+        self.buffer = buffer
+        self.result: str | None = None
+        self._launcher = launcher
+        self._task = asyncio.create_task(run)
+
+    def __aiter__(self) -> "TaskStream":
+        return self
+
+    async def __anext__(self) -> EventType:
+        event = await self.buffer.get()
+        if event is not None:
+            return event
+        await asyncio.wait([self._task])
+        if not self._task.cancelled():
+            self.result = self._task.result()
+        raise StopAsyncIteration
+
+    async def __aenter__(self) -> "TaskStream":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if not self._task.done():
+            await self._launcher.cancel(self.agent_id, reason="Stream closed")
+        self.buffer.close()
+        await asyncio.wait([self._task])
+        if not self._task.cancelled():
+            self.result = self._task.result()
+
+
+@dataclass(slots=True)
+class TaskResult:
+    index: int
+    task: str
+    result: str | None
+    error: BaseException | None = None
+
+
+@dataclass
+class BatchStats:
+    submitted: int
+    completed: int
+    failed: int
+    timed_out: int
+    in_flight: int
+    elapsed: float
+    throughput: float
+
+
+class TaskBatch:
+    def __init__(
+        self,
+        launcher: "AgentLauncher",
+        tasks: Iterable[str] | AsyncIterable[str],
+        max_concurrency: int,
+        timeout: float | None,
+        priority: int = 0,
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive.")
+        self.max_concurrency = max_concurrency
+        self._launcher = launcher
+        self._timeout = timeout
+        self._priority = priority
+        self._source: Iterator[str] | AsyncIterator[str] = (
+            aiter(tasks) if isinstance(tasks, AsyncIterable) else iter(tasks)
+        )
+        self._exhausted = False
+        self._running: dict[asyncio.Task[TaskResult], str] = {}
+        self._ready: deque[TaskResult] = deque()
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    @property
+    def stats(self) -> BatchStats:
+        started_at = self._started_at or time.perf_counter()
+        elapsed = (self._finished_at or time.perf_counter()) - started_at
+        return BatchStats(
+            submitted=self.submitted,
+            completed=self.completed,
+            failed=self.failed,
+            timed_out=self.timed_out,
+            in_flight=len(self._running),
+            elapsed=elapsed,
+            throughput=self.completed / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def __aiter__(self) -> "TaskBatch":
+        return self
+
+    async def __anext__(self) -> TaskResult:
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        while not self._ready:
+            await self._admit()
+            if not self._running:
+                if self._finished_at is None:
+                    self._finished_at = time.perf_counter()
+                raise StopAsyncIteration
+            done, _ = await asyncio.wait(
+                self._running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                del self._running[task]
+                self._ready.append(task.result())
+            await self._admit()
+        return self._ready.popleft()
+
+    async def __aenter__(self) -> "TaskBatch":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._exhausted = True
+        for task, agent_id in list(self._running.items()):
+            if not task.done():
+                await self._launcher.cancel(agent_id, reason="Batch closed")
+        if self._running:
+            await asyncio.wait(self._running)
+        self._running.clear()
+        self._ready.clear()
+        if self._started_at is not None and self._finished_at is None:
+            self._finished_at = time.perf_counter()
+
+    async def _admit(self) -> None:
+        while not self._exhausted and len(self._running) < self.max_concurrency:
+            if isinstance(self._source, AsyncIterator):
+                task = await anext(self._source, None)
+            else:
+                task = next(self._source, None)
+            if task is None:
+                self._exhausted = True
+                return
+            agent_id = self._launcher._new_agent_id(None)
+            runner = asyncio.create_task(self._run(self.submitted, task, agent_id))
+            self._running[runner] = agent_id
+            self.submitted += 1
+
+    async def _run(self, index: int, task: str, agent_id: str) -> TaskResult:
+        try:
+            result = await self._launcher._run(
+                agent_id, task, self._timeout, (), None, self._priority
+            )
+        except asyncio.CancelledError as e:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            return self._record(TaskResult(index, task, None, e))
+        except Exception as e:
+            return self._record(TaskResult(index, task, None, e))
+        return self._record(TaskResult(index, task, result))
+
+    def _record(self, outcome: TaskResult) -> TaskResult:
+        self.completed += 1
+        if outcome.error is not None:
+            self.failed += 1
+        elif outcome.result is None:
+            self.timed_out += 1
+        return outcome
 
 
 class AgentLauncher:
@@ -39,17 +261,28 @@ class AgentLauncher:
         system_prompt: str = PRIMARY_AGENT_SYSTEM_PROMPT,
         sub_agent_tool: bool = True,
         conversation_session: ConversationSession | None = None,
+        event_bus: EventBus | None = None,
+        scheduler: "AdmissionScheduler | None" = None,
     ):
-        self.event_bus = EventBus()
+        install_event_loop_policy()
+        self.event_bus = event_bus or EventBus()
         self.system_prompt = system_prompt
+        self.scheduler = scheduler
+        self._event_subscriptions: list[EventSubscription] = []
+        self.usage_runtime = UsageRuntime(self.event_bus)
         self.agent_runtime = AgentRuntime(
             self.event_bus,
             conversation_session=conversation_session or InMemoryConversationSession(),
+            usage=self.usage_runtime,
         )
         self.llm_runtime = LLMRuntime(self.event_bus)
         self.tool_runtime = ToolRuntime(self.event_bus, sub_agent_tool=sub_agent_tool)
         self.runtimes: list[RuntimeType] = []
         self.event_bus.subscribe(TaskFinishEvent, self.handle_task_finish)
+        self.event_bus.subscribe(TaskCancelEvent, self.handle_task_cancel)
+        self.event_bus.subscribe(
+            AgentLauncherStopEvent, self.handle_remote_launcher_stop, remote=True
+        )
         self._final_results: dict[str, asyncio.Future[str]] = {}
         self._result_lock = asyncio.Lock()
 
@@ -119,9 +352,40 @@ class AgentLauncher:
 
         return decorator
 
-    def subscribe_event(self, event_type: type[EventType]):
+    def set_token_budget(self, budget: TokenBudget | None) -> None:
+        self.usage_runtime.budget = budget
+
+    def set_token_estimator(self, estimator: TokenEstimator) -> None:
+        self.usage_runtime.estimator = estimator
+
+    def add_conversation_processor(self, processor: ConversationProcessor) -> None:
+        if isinstance(processor, TurnSummarizer):
+            processor.fallback_llm_processor = lambda: (
+                self.llm_runtime.sub_agent_llm_processor
+                or self.llm_runtime.primary_agent_llm_processor
+            )
+        self.agent_runtime.conversation_processors.append(processor)
+
+    def conversation_processor(self):
+        def decorator(func):
+            self.add_conversation_processor(func)
+            return func
+
+        return decorator
+
+    def subscribe_event(
+        self,
+        event_type: type[EventType],
+        *,
+        priority: int = 0,
+        agent_prefix: str | None = None,
+        where: Mapping[str, Any] | EventMatcher | None = None,
+    ):
+        options = {"priority": priority, "agent_prefix": agent_prefix, "where": where}
+
         def decorator(func: EventHandler[Any]):
-            self.event_bus.subscribe(event_type, func)
+            self.event_bus.subscribe(event_type, func, **options)
+            self._event_subscriptions.append((event_type, func, options))
             return func
 
         return decorator
@@ -132,9 +396,26 @@ class AgentLauncher:
         )
         async with self._result_lock:
             future = self._final_results.get(event.agent_id)
-            if future is None or future.done():
+            if future is None:
+                self.event_bus.release_agent(event.agent_id)
+                return
+            if not future.done():
+                future.set_result(event.result or "")
+
+    async def handle_remote_launcher_stop(self, event: AgentLauncherStopEvent) -> None:
+        async with self._result_lock:
+            future = self._final_results.get(event.agent_id)
+            if future is not None and not future.done():
+                future.set_result(event.result or "")
+
+    async def handle_task_cancel(self, event: TaskCancelEvent) -> None:
+        async with self._result_lock:
+            if event.agent_id in self._final_results:
                 return
-            future.set_result(event.result or "")
+        self.event_bus.cancel_agent_tasks(
+            event.agent_id, keep=TASK_CLEANUP_EVENTS, reason=event.reason
+        )
+        self.event_bus.release_agent(event.agent_id)
 
     async def run(
         self,
@@ -143,18 +424,104 @@ class AgentLauncher:
         timeout: float | None = 600.0,
         event_hook: EventBusHook | None = None,
         session_context: SessionContext | None = None,
+        event_hooks: Sequence[EventBusHook] = (),
+        priority: int = 0,
+    ) -> str | None:
+        return await self._run(
+            self._new_agent_id(session_context),
+            task,
+            timeout,
+            (event_hook, *event_hooks),
+            session_context,
+            priority,
+        )
+
+    def stream(
+        self,
+        task: str,
+        history: list[Message] | None = None,
+        timeout: float | None = 600.0,
+        session_context: SessionContext | None = None,
+        event_types: Iterable[type[EventType]] | None = None,
+        maxsize: int = 1024,
+        policy: HookPolicy = "block",
+        priority: int = 0,
+    ) -> TaskStream:
+        agent_id = self._new_agent_id(session_context)
+        buffer = EventHookQueue(maxsize, policy, event_types)
+        return TaskStream(
+            self,
+            agent_id,
+            buffer,
+            self._run(agent_id, task, timeout, (buffer,), session_context, priority),
+        )
+
+    def run_many(
+        self,
+        tasks: Iterable[str] | AsyncIterable[str],
+        max_concurrency: int = 32,
+        timeout: float | None = 600.0,
+        priority: int = 0,
+    ) -> TaskBatch:
+        return TaskBatch(self, tasks, max_concurrency, timeout, priority)
+
+    async def resume(
+        self,
+        directory: str | os.PathLike[str],
+        agent_id: str,
+        serializer: "EventSerializer | None" = None,
+        timeout: float | None = 600.0,
+        event_hook: EventBusHook | None = None,
+        event_hooks: Sequence[EventBusHook] = (),
+        priority: int = 0,
+    ) -> str | None:
+        from agentlauncher.eventbus.journal import read_journal
+
+        events = list(read_journal(directory, serializer, agent_id))
+        task = next((e for e in events if isinstance(e, TaskCreateEvent)), None)
+        if task is None:
+            raise ValueError(f"No task for agent {agent_id} in the journal.")
+        session_context = task.session_context or None
+        new_agent_id = self._new_agent_id(session_context)
+        recorded = RecordedResponses.from_events(events)
+        self.llm_runtime.recorded[new_agent_id] = recorded
+        self.tool_runtime.recorded[new_agent_id] = recorded
+        try:
+            return await self._run(
+                new_agent_id,
+                task.task,
+                timeout,
+                (event_hook, *event_hooks),
+                session_context,
+                priority,
+            )
+        finally:
+            self.llm_runtime.recorded.pop(new_agent_id, None)
+            self.tool_runtime.recorded.pop(new_agent_id, None)
+
+    def _new_agent_id(self, session_context: SessionContext | None) -> str:
+        return generate_primary_agent_id()
+
+    async def _run(
+        self,
+        agent_id: str,
+        task: str,
+        timeout: float | None,
+        event_hooks: Iterable[EventBusHook | None],
+        session_context: SessionContext | None,
+        priority: int = 0,
     ) -> str | None:
-        agent_id = generate_primary_agent_id()
-        future = asyncio.get_running_loop().create_future()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self.event_bus.watch(agent_id)
+        for hook in event_hooks:
+            if hook is not None:
+                await self.event_bus.add_hook(agent_id, hook)
         await self.event_bus.emit(AgentLauncherRunEvent(agent_id=agent_id, task=task))
-        await self.agent_runtime.add_session_context(agent_id, session_context or {})
 
         async with self._result_lock:
-            self.tool_runtime.setup_sub_agent_tool()
             self._final_results[agent_id] = future
-            tool_schemas = self.tool_runtime.get_tool_schemas(
-                list(self.tool_runtime.tools.keys())
-            )
+        tool_schemas = self.tool_runtime.registry.schemas
 
         timeout_reason = (
             f"Task timed out after {timeout} seconds"
@@ -162,24 +529,37 @@ class AgentLauncher:
             else "Task timed out"
         )
         result: str | None = None
+        finished = False
+        deadline = None if timeout is None else loop.time() + timeout
+        task_deadline = None if timeout is None else time.monotonic() + timeout
+        self.event_bus.open_cancellation_token(agent_id, task_deadline)
 
         try:
-            if event_hook is not None:
-                await self.event_bus.add_hook(agent_id, event_hook)
-
+            if self.scheduler is not None:
+                await asyncio.wait_for(
+                    self.scheduler.acquire(
+                        agent_id, priority, self.scheduler.tenant_of(session_context)
+                    ),
+                    timeout,
+                )
             await self.event_bus.emit(
                 TaskCreateEvent(
                     agent_id=agent_id,
                     task=task,
                     system_prompt=self.system_prompt,
                     tool_schemas=tool_schemas,
+                    session_context=session_context or {},
+                    deadline=task_deadline,
                 )
             )
 
-            if timeout is None:
+            if deadline is None:
                 result = await future
             else:
-                result = await asyncio.wait_for(future, timeout=timeout)
+                result = await asyncio.wait_for(
+                    future, timeout=max(deadline - loop.time(), 0)
+                )
+            finished = True
         except TimeoutError:
             await self.cancel(agent_id, reason=timeout_reason)
             return None
@@ -187,6 +567,14 @@ class AgentLauncher:
             async with self._result_lock:
                 self._final_results.pop(agent_id, None)
             await self.event_bus.remove_hook(agent_id)
+            await self.event_bus.unwatch(agent_id)
+            if finished:
+                self.event_bus.cancellation_token(agent_id).cancel("Task finished")
+            else:
+                self.event_bus.cancel_agent_tasks(agent_id, keep=TASK_CLEANUP_EVENTS)
+            self.event_bus.release_agent(agent_id)
+            if self.scheduler is not None:
+                self.scheduler.release(agent_id)
 
         return result
 
@@ -200,13 +588,52 @@ class AgentLauncher:
     def register_runtime(self, runtime_type: type[RuntimeType]) -> None:
         self.runtimes.append(runtime_type(self.event_bus))
 
+    def clone(
+        self,
+        event_bus: EventBus | None = None,
+        scheduler: "AdmissionScheduler | None" = None,
+    ) -> "AgentLauncher":
+        launcher = AgentLauncher(
+            system_prompt=self.system_prompt,
+            sub_agent_tool=self.tool_runtime.enable_sub_agent_tool,
+            conversation_session=self.agent_runtime.primary_agent_conversation_session,
+            event_bus=event_bus,
+            scheduler=scheduler,
+        )
+        launcher.llm_runtime.min_request_budget = self.llm_runtime.min_request_budget
+        launcher.set_token_budget(self.usage_runtime.budget)
+        launcher.set_token_estimator(self.usage_runtime.estimator)
+        launcher.tool_runtime.register_tools(
+            self.tool_runtime.registered_tools.values()
+        )
+        if self.llm_runtime.primary_agent_llm_processor is not None:
+            launcher.set_primary_agent_llm_processor(
+                self.llm_runtime.primary_agent_llm_processor
+            )
+        if self.llm_runtime.sub_agent_llm_processor is not None:
+            launcher.set_sub_agent_llm_processor(
+                self.llm_runtime.sub_agent_llm_processor
+            )
+        for processor in self.agent_runtime.conversation_processors:
+            launcher.add_conversation_processor(processor)
+        for runtime in self.runtimes:
+            launcher.register_runtime(type(runtime))
+        for event_type, func, options in self._event_subscriptions:
+            launcher.subscribe_event(event_type, **options)(func)
+        return launcher
+
     async def cancel(self, agent_id: str, reason: str | None = None) -> None:
         async with self._result_lock:
             future = self._final_results.pop(agent_id, None)
         was_primary = future is not None
         if future and not future.done():
             future.cancel()
+        if self.scheduler is not None:
+            self.scheduler.cancel(agent_id)
         cancel_reason = reason or "Task cancelled"
+        self.event_bus.cancel_agent_tasks(
+            agent_id, keep=TASK_CLEANUP_EVENTS, reason=cancel_reason
+        )
         await self.event_bus.emit(
             TaskCancelEvent(agent_id=agent_id, reason=cancel_reason)
         )
@@ -1,6 +1,7 @@
 from .message import (
     AssistantMessage,
     Message,
+    MessageView,
     RequestMessageList,
     RequestToolList,
     ResponseMessageList,
@@ -10,10 +11,16 @@ from .message import (
     UserMessage,
 )
 from .processor import LLMProcessor
-from .tool import ToolParamSchema, ToolSchema
+from .tokens import (
+    TokenEstimator,
+    estimate_message_tokens,
+    estimate_text_tokens,
+)
+from .tool import FrozenToolParamSchema, ToolParamSchema, ToolSchema
 
 __all__ = [
     "Message",
+    "MessageView",
     "UserMessage",
     "SystemMessage",
     "ToolCallMessage",
@@ -22,7 +29,11 @@ __all__ = [
     "LLMProcessor",
     "ToolSchema",
     "ToolParamSchema",
+    "FrozenToolParamSchema",
     "ResponseMessageList",
     "RequestMessageList",
     "RequestToolList",
+    "TokenEstimator",
+    "estimate_message_tokens",
+    "estimate_text_tokens",
 ]
@@ -1,32 +1,35 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from itertools import islice
+from operator import is_
+from typing import Any, overload
 
 from .tool import ToolSchema
 
 
-@dataclass
+@dataclass(slots=True)
 class UserMessage:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemMessage:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallMessage:
     tool_call_id: str
     tool_name: str
     arguments: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantMessage:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultMessage:
     tool_call_id: str
     tool_name: str
@@ -37,6 +40,73 @@ type Message = (
     UserMessage | SystemMessage | ToolCallMessage | AssistantMessage | ToolResultMessage
 )
 
+
+class MessageView(Sequence[Message]):
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: list[Message], length: int | None = None):
+        self._items = items
+        self._length = len(items) if length is None else length
+
+    @classmethod
+    def snapshot(cls, messages: Sequence[Message]) -> "MessageView":
+        if isinstance(messages, MessageView):
+            return cls(messages._items, messages._length)
+        return cls(list(messages))
+
+    def is_prefix_of(self, messages: Sequence[Message]) -> bool:
+        if self._length > len(messages):
+            return False
+        if isinstance(messages, MessageView) and messages._items is self._items:
+            return True
+        return all(map(is_, self, messages))
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Message]: ...
+
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        if isinstance(index, slice):
+            positions = range(self._length)[index]
+            if positions.step == 1:
+                return self._items[positions.start : positions.stop]
+            return [self._items[i] for i in positions]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("message index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Message]:
+        return islice(self._items, self._length)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MessageView | list | tuple):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Iterable[Message]) -> list[Message]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[Message]) -> list[Message]:
+        return [*other, *self]
+
+    def __repr__(self) -> str:
+        return f"MessageView({list(self)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
 type RequestMessageList = Sequence[Message]
 
 type RequestToolList = Sequence[ToolSchema]
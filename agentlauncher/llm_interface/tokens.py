@@ -0,0 +1,38 @@
+from collections.abc import Callable
+
+from .message import (
+    AssistantMessage,
+    Message,
+    SystemMessage,
+    ToolCallMessage,
+    ToolResultMessage,
+    UserMessage,
+)
+
+type TokenEstimator = Callable[[Message], int]
+
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_text_tokens(text: str) -> int:
+    if text.isascii():
+        return (len(text) + 3) // 4
+    ascii_length = len(text.encode("ascii", "ignore"))
+    return (ascii_length + 3) // 4 + len(text) - ascii_length
+
+
+def estimate_message_tokens(message: Message) -> int:
+    match message:
+        case (
+            UserMessage(content=text)
+            | SystemMessage(content=text)
+            | AssistantMessage(content=text)
+        ):
+            pass
+        case ToolCallMessage():
+            text = f"{message.tool_name}{message.arguments}"
+        case ToolResultMessage():
+            text = message.result
+        case _:
+            text = str(message)
+    return estimate_text_tokens(text) + MESSAGE_TOKEN_OVERHEAD
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolParamSchema:
     type: str
     description: str
@@ -9,8 +9,16 @@ class ToolParamSchema:
     items: dict | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class FrozenToolParamSchema:
+    type: str
+    description: str
+    required: bool
+    items: dict | None = None
+
+
+@dataclass(slots=True)
 class ToolSchema:
     name: str
     description: str
-    parameters: dict[str, ToolParamSchema]
+    parameters: dict[str, ToolParamSchema | FrozenToolParamSchema]
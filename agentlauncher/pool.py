@@ -0,0 +1,188 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zlib
+from collections.abc import Callable, Mapping
+from multiprocessing.process import BaseProcess
+from typing import Any, Literal
+
+from agentlauncher.eventbus import (
+    EventBroker,
+    EventBus,
+    EventSerializer,
+    PickleSerializer,
+    UnixSocketTransport,
+)
+from agentlauncher.eventbus.transport import partition_of
+from agentlauncher.launcher import AgentLauncher
+from agentlauncher.scheduler import AdmissionScheduler
+from agentlauncher.session import ConversationSession, SessionContext
+from agentlauncher.shared import (
+    PRIMARY_AGENT_SYSTEM_PROMPT,
+    generate_primary_agent_id,
+    install_event_loop_policy,
+)
+
+type PoolStrategy = Literal["least_loaded", "session"]
+type LauncherSetup = Callable[[AgentLauncher], None]
+
+
+class AgentLauncherPool(AgentLauncher):
+    def __init__(
+        self,
+        setup: LauncherSetup,
+        workers: int | None = None,
+        strategy: PoolStrategy = "least_loaded",
+        session_key: str = "session_id",
+        system_prompt: str = PRIMARY_AGENT_SYSTEM_PROMPT,
+        sub_agent_tool: bool = True,
+        conversation_session: ConversationSession | None = None,
+        scheduler: AdmissionScheduler | None = None,
+        serializer: Callable[[], EventSerializer] = PickleSerializer,
+        event_bus_options: Mapping[str, Any] | None = None,
+        path: str | None = None,
+        start_method: str = "forkserver",
+        start_timeout: float = 60.0,
+    ):
+        worker_count = workers or os.cpu_count() or 1
+        if worker_count <= 0:
+            raise ValueError("workers must be positive.")
+        if strategy not in ("least_loaded", "session"):
+            raise ValueError(f"Unknown pool strategy: {strategy}")
+        self._socket_dir: str | None = None
+        if path is None:
+            self._socket_dir = tempfile.mkdtemp(prefix="agentlauncher-")
+            path = os.path.join(self._socket_dir, "bus.sock")
+        self.path = path
+        self.worker_count = worker_count
+        self.strategy = strategy
+        self.session_key = session_key
+        self.start_timeout = start_timeout
+        self._setup = setup
+        self._worker_options = (
+            system_prompt,
+            sub_agent_tool,
+            conversation_session,
+            serializer,
+            dict(event_bus_options or {}),
+        )
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            self._context.set_forkserver_preload(
+                ["agentlauncher.launcher", "agentlauncher.pool"]
+            )
+        self._processes: list[BaseProcess] = []
+        self._broker: EventBroker | None = None
+        self._loads = [0] * worker_count
+        super().__init__(
+            system_prompt=system_prompt,
+            sub_agent_tool=sub_agent_tool,
+            event_bus=EventBus(
+                transport=UnixSocketTransport(self.path, [], worker_count, serializer())
+            ),
+            scheduler=scheduler,
+        )
+        setup(self)
+
+    @property
+    def worker_loads(self) -> list[int]:
+        return list(self._loads)
+
+    async def __aenter__(self) -> "AgentLauncherPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._broker is not None:
+            return
+        self._broker = EventBroker(self.path, self.worker_count)
+        await self._broker.start()
+        for index in range(self.worker_count):
+            process = self._context.Process(
+                target=_serve_worker,
+                args=(self.path, index, self.worker_count, self._setup)
+                + self._worker_options,
+                name=f"agentlauncher-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        try:
+            await asyncio.wait_for(
+                self._broker.wait_until_owned(), timeout=self.start_timeout
+            )
+        except TimeoutError:
+            await self.close()
+            raise RuntimeError("Pool workers did not start in time.") from None
+        await self.event_bus.start()
+
+    async def close(self) -> None:
+        await self.shutdown()
+        await self.event_bus.close()
+        if self._broker is not None:
+            await self._broker.close()
+            self._broker = None
+        for process in self._processes:
+            await asyncio.to_thread(process.join, 5.0)
+            if process.is_alive():
+                process.terminate()
+                await asyncio.to_thread(process.join)
+        self._processes.clear()
+        if self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+
+    def _new_agent_id(self, session_context: SessionContext | None) -> str:
+        worker = self._pick_worker(session_context)
+        while True:
+            agent_id = generate_primary_agent_id()
+            if partition_of(agent_id, self.worker_count) == worker:
+                self._loads[worker] += 1
+                return agent_id
+
+    def _pick_worker(self, session_context: SessionContext | None) -> int:
+        if self.strategy == "session" and session_context:
+            session_id = session_context.get(self.session_key)
+            if session_id is not None:
+                return zlib.crc32(str(session_id).encode()) % self.worker_count
+        return min(range(self.worker_count), key=self._loads.__getitem__)
+
+    async def _run(self, agent_id: str, *args: Any) -> str | None:
+        try:
+            return await super()._run(agent_id, *args)
+        finally:
+            self._loads[partition_of(agent_id, self.worker_count)] -= 1
+
+
+def _serve_worker(
+    path: str,
+    index: int,
+    worker_count: int,
+    setup: LauncherSetup,
+    system_prompt: str,
+    sub_agent_tool: bool,
+    conversation_session: ConversationSession | None,
+    serializer: Callable[[], EventSerializer],
+    event_bus_options: dict[str, Any],
+) -> None:
+    async def serve() -> None:
+        transport = UnixSocketTransport(path, [index], worker_count, serializer())
+        launcher = AgentLauncher(
+            system_prompt=system_prompt,
+            sub_agent_tool=sub_agent_tool,
+            conversation_session=conversation_session,
+            event_bus=EventBus(transport=transport, **event_bus_options),
+        )
+        setup(launcher)
+        await launcher.event_bus.start()
+        try:
+            await transport.wait_closed()
+        finally:
+            await launcher.event_bus.close()
+
+    install_event_loop_policy()
+    asyncio.run(serve())
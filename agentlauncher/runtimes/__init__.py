@@ -1,11 +1,30 @@
 from .agent import AgentRuntime
+from .compaction import (
+    ConversationCompactor,
+    ConversationProcessor,
+    SlidingWindow,
+    ToolResultTruncator,
+    TurnSummarizer,
+)
 from .llm import LLMRuntime
-from .tool import ToolRuntime
+from .recording import RecordedResponses
+from .tool import ToolRegistry, ToolRuntime
 from .type import RuntimeType
+from .usage import TokenBudget, TokenUsage, UsageRuntime
 
 __all__ = [
     "ToolRuntime",
+    "ToolRegistry",
     "LLMRuntime",
     "AgentRuntime",
     "RuntimeType",
+    "RecordedResponses",
+    "ConversationCompactor",
+    "ConversationProcessor",
+    "SlidingWindow",
+    "ToolResultTruncator",
+    "TurnSummarizer",
+    "TokenBudget",
+    "TokenUsage",
+    "UsageRuntime",
 ]
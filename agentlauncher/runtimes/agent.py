@@ -1,8 +1,10 @@
-from asyncio import Lock
-from collections.abc import Awaitable, Callable, Sequence
+import asyncio
+import inspect
+from collections.abc import Sequence
 
-from agentlauncher.eventbus import EventBus, EventContext
+from agentlauncher.eventbus import EventBus, EventContext, TokenCancelledError
 from agentlauncher.events import (
+    AgentConversationProcessedEvent,
     AgentCreateEvent,
     AgentDeletedEvent,
     AgentFinishEvent,
@@ -15,6 +17,8 @@ from agentlauncher.events import (
     TaskCancelEvent,
     TaskCreateEvent,
     TaskFinishEvent,
+    TaskUsageEvent,
+    TokenBudgetExceededEvent,
     ToolCall,
     ToolsExecRequestEvent,
     ToolsExecResultsEvent,
@@ -23,6 +27,7 @@ from agentlauncher.events.tool import ToolResult
 from agentlauncher.llm_interface import (
     AssistantMessage,
     Message,
+    MessageView,
     SystemMessage,
     ToolCallMessage,
     ToolResultMessage,
@@ -36,19 +41,13 @@ from agentlauncher.session import (
 )
 from agentlauncher.shared import (
     PRIMARY_AGENT_SYSTEM_PROMPT,
-    get_primary_agent_id,
+    AgentId,
     is_primary_agent,
 )
 
+from .compaction import ConversationCompactor, ConversationProcessor
 from .type import RuntimeType
-
-type ConversationProcessor = Callable[
-    [
-        list[Message],
-        EventContext,
-    ],
-    Awaitable[list[Message]] | list[Message],
-]
+from .usage import BUDGET_SUMMARY_PROMPT, UsageRuntime
 
 
 class Agent:
@@ -59,47 +58,141 @@ class Agent:
         event_bus: EventBus,
         conversation_session: ConversationSession,
         system_prompt: str | None = None,
+        conversation_processors: Sequence[ConversationProcessor] = (),
+        usage: UsageRuntime | None = None,
     ):
         self.agent_id = agent_id
         self.system_prompt = system_prompt
         self.tool_schemas = tool_schemas
         self.event_bus = event_bus
         self.conversation_session = conversation_session
+        self.conversation_processors = conversation_processors
+        self.usage = usage
+        self.cancel_token = event_bus.cancellation_token(agent_id)
+        self._system_messages: list[Message] = (
+            [SystemMessage(content=system_prompt)] if system_prompt else []
+        )
+        self._messages: list[Message] | None = None
+        self._responses = 0
+        self._budget_reason: str | None = None
 
     async def close(self) -> None:
+        self._messages = None
+        for processor in self.conversation_processors:
+            if isinstance(processor, ConversationCompactor):
+                processor.release(self.agent_id)
         await self.conversation_session.close()
 
-    async def _build_message_list(self) -> list[Message]:
-        await self.conversation_session.prepare_messages()
-        base = await self.conversation_session.load()
-        return (
-            [SystemMessage(content=self.system_prompt)] + base
-            if self.system_prompt
-            else base
+    async def _append_messages(self, messages: list[Message]) -> None:
+        await self.conversation_session.append(messages)
+        if self._messages is not None and self.conversation_session.incremental:
+            self._messages.extend(messages)
+
+    async def _build_message_list(self) -> MessageView:
+        if self._messages is None or not self.conversation_session.incremental:
+            await self.conversation_session.prepare_messages()
+            base = await self.conversation_session.load()
+            self._messages = [*self._system_messages, *base]
+        return MessageView(self._messages)
+
+    async def _process_messages(
+        self, messages: Sequence[Message]
+    ) -> Sequence[Message] | None:
+        if not self.conversation_processors:
+            return messages
+        context = EventContext(agent_id=self.agent_id, event_bus=self.event_bus)
+        processed = messages
+        try:
+            for processor in self.conversation_processors:
+                result = processor(processed, context)
+                processed = await result if inspect.isawaitable(result) else result
+        except TokenCancelledError:
+            return None
+        except Exception as e:
+            await self.event_bus.emit(
+                AgentRuntimeErrorEvent(
+                    agent_id=self.agent_id,
+                    error=f"Conversation processor failed: {e}",
+                )
+            )
+            return None
+        if processed is not messages:
+            await self.event_bus.emit(
+                AgentConversationProcessedEvent(
+                    agent_id=self.agent_id,
+                    original_messages=messages,
+                    processed_messages=processed,
+                )
+            )
+        return processed
+
+    async def _request_llm(self) -> None:
+        if self._budget_reason is None and self.usage is not None:
+            reason = self.usage.exceeded(self.agent_id)
+            if reason is not None:
+                await self._stop_for_budget(self.usage, reason)
+                return
+        messages = await self._process_messages(await self._build_message_list())
+        if messages is None:
+            return
+        await self.event_bus.emit(
+            LLMRequestEvent(
+                agent_id=self.agent_id,
+                messages=messages,
+                tool_schemas=self.tool_schemas,
+                deadline=self.cancel_token.deadline,
+            )
         )
 
-    async def start(self, task: str) -> None:
-        await self.event_bus.emit(AgentStartEvent(agent_id=self.agent_id))
-        user_message = UserMessage(content=task)
-        await self.conversation_session.append([user_message])
+    async def _stop_for_budget(self, usage_runtime: UsageRuntime, reason: str) -> None:
+        self._budget_reason = reason
+        usage = usage_runtime.task_usage(self.agent_id)
         await self.event_bus.emit(
-            MessagesAddEvent(agent_id=self.agent_id, messages=[user_message])
+            TokenBudgetExceededEvent(
+                agent_id=self.agent_id,
+                reason=reason,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cost=usage.cost,
+            )
         )
+        budget = usage_runtime.budget
+        if budget is None or not budget.summarize or not self._responses:
+            await self.event_bus.emit(
+                AgentFinishEvent(agent_id=self.agent_id, result=reason)
+            )
+            return
+        messages = await self._process_messages(await self._build_message_list())
+        if messages is None:
+            return
         await self.event_bus.emit(
             LLMRequestEvent(
                 agent_id=self.agent_id,
-                messages=await self._build_message_list(),
-                tool_schemas=self.tool_schemas,
+                messages=[*messages, UserMessage(content=BUDGET_SUMMARY_PROMPT)],
+                tool_schemas=[],
+                deadline=self.cancel_token.deadline,
             )
         )
 
+    async def start(self, task: str) -> None:
+        await self.event_bus.emit(AgentStartEvent(agent_id=self.agent_id))
+        user_message = UserMessage(content=task)
+        await self._append_messages([user_message])
+        await self.event_bus.emit(
+            MessagesAddEvent(agent_id=self.agent_id, messages=[user_message])
+        )
+        await self._request_llm()
+
     async def handle_llm_response(
         self, response: Sequence[AssistantMessage | ToolCallMessage]
     ) -> None:
+        self._responses += 1
+        if self._budget_reason is not None:
+            response = [msg for msg in response if isinstance(msg, AssistantMessage)]
         await self.event_bus.emit(
             MessagesAddEvent(agent_id=self.agent_id, messages=response)
         )
-        await self.conversation_session.append(list(response))
+        await self._append_messages(list(response))
         tool_calls = [
             ToolCall(msg.tool_call_id, msg.tool_name, msg.arguments)
             for msg in response
@@ -110,12 +203,20 @@ class Agent:
                 msg.content for msg in response if isinstance(msg, AssistantMessage)
             ]
             final_response = "\n".join(assistant_contents) if assistant_contents else ""
+            if self._budget_reason is not None:
+                final_response = "\n\n".join(
+                    filter(None, (final_response, self._budget_reason))
+                )
             await self.event_bus.emit(
                 AgentFinishEvent(agent_id=self.agent_id, result=final_response)
             )
             return
         await self.event_bus.emit(
-            ToolsExecRequestEvent(agent_id=self.agent_id, tool_calls=tool_calls)
+            ToolsExecRequestEvent(
+                agent_id=self.agent_id,
+                tool_calls=tool_calls,
+                deadline=self.cancel_token.deadline,
+            )
         )
 
     async def handle_tools_exec_results(self, tool_results: list[ToolResult]) -> None:
@@ -130,15 +231,11 @@ class Agent:
         await self.event_bus.emit(
             MessagesAddEvent(agent_id=self.agent_id, messages=tool_result_messages)
         )
-        await self.conversation_session.append(list(tool_result_messages))
+        await self._append_messages(list(tool_result_messages))
+        if self.cancel_token.cancelled:
+            return
 
-        await self.event_bus.emit(
-            LLMRequestEvent(
-                agent_id=self.agent_id,
-                messages=await self._build_message_list(),
-                tool_schemas=self.tool_schemas,
-            )
-        )
+        await self._request_llm()
 
 
 class AgentRuntime(RuntimeType):
@@ -146,33 +243,85 @@ class AgentRuntime(RuntimeType):
         self,
         event_bus: EventBus,
         conversation_session: ConversationSession,
+        usage: UsageRuntime | None = None,
     ):
         super().__init__(event_bus)
+        self.usage = usage
         self.primary_agent_conversation_session = conversation_session
         self.sub_agent_conversation_session = InMemoryConversationSession()
-        self.event_bus.subscribe(AgentCreateEvent, self.handle_agent_create)
-        self.event_bus.subscribe(LLMResponseEvent, self.handle_llm_response)
-        self.event_bus.subscribe(ToolsExecResultsEvent, self.handle_tools_exec_results)
-        self.event_bus.subscribe(AgentFinishEvent, self.handle_agent_finish)
-        self.event_bus.subscribe(TaskCreateEvent, self.handle_task_create)
-        self.event_bus.subscribe(TaskFinishEvent, self.handle_task_finish)
-        self.event_bus.subscribe(TaskCancelEvent, self.handle_task_cancel)
-        self.event_bus.subscribe(
-            AgentRuntimeErrorEvent, self.handle_agent_runtime_error
+        self.conversation_processors: list[ConversationProcessor] = []
+        self.subscribe(AgentCreateEvent, self.handle_agent_create, ordered=True)
+        self.subscribe(LLMResponseEvent, self.handle_llm_response, ordered=True)
+        self.subscribe(
+            ToolsExecResultsEvent, self.handle_tools_exec_results, ordered=True
+        )
+        self.subscribe(AgentFinishEvent, self.handle_agent_finish, ordered=True)
+        self.subscribe(TaskCreateEvent, self.handle_task_create, ordered=True)
+        self.subscribe(TaskFinishEvent, self.handle_task_finish, ordered=True)
+        self.subscribe(TaskCancelEvent, self.handle_task_cancel, ordered=True)
+        self.subscribe(
+            AgentRuntimeErrorEvent, self.handle_agent_runtime_error, ordered=True
         )
-        self.event_bus.subscribe(
-            AgentLauncherShutdownEvent, self.handle_launcher_shutdown
+        self.subscribe(
+            AgentLauncherShutdownEvent, self.handle_launcher_shutdown, ordered=True
         )
         self.agents: dict[str, Agent] = {}
-        self._agents_lock = Lock()
+        self.task_agents: dict[str, set[str]] = {}
         self._cancelled_agents: set[str] = set()
         self.session_context: dict[str, SessionContext] = {}
 
     async def add_session_context(self, agent_id: str, context: SessionContext) -> None:
-        async with self._agents_lock:
-            self.session_context[agent_id] = context
+        self.session_context[agent_id] = context
+
+    def _add_agent(self, agent: Agent) -> None:
+        self.agents[agent.agent_id] = agent
+        primary = AgentId.of(agent.agent_id).primary
+        agent_ids = self.task_agents.get(primary)
+        if agent_ids is None:
+            agent_ids = self.task_agents[primary] = set()
+        agent_ids.add(agent.agent_id)
+
+    def _pop_agent(self, agent_id: str) -> Agent | None:
+        agent = self.agents.pop(agent_id, None)
+        if agent is None:
+            return None
+        self.session_context.pop(agent_id, None)
+        primary = AgentId.of(agent_id).primary
+        agent_ids = self.task_agents.get(primary)
+        if agent_ids is not None:
+            agent_ids.discard(agent_id)
+            if not agent_ids:
+                del self.task_agents[primary]
+        return agent
+
+    def _pop_task(self, primary_agent_id: str) -> dict[str, Agent]:
+        self.session_context.pop(primary_agent_id, None)
+        agents: dict[str, Agent] = {}
+        for agent_id in self.task_agents.pop(primary_agent_id, ()):
+            agent = self.agents.pop(agent_id, None)
+            if agent is not None:
+                agents[agent_id] = agent
+                self.session_context.pop(agent_id, None)
+        return agents
+
+    async def _emit_task_usage(self, agent_id: str) -> None:
+        usage = self.usage.pop_task(agent_id) if self.usage is not None else None
+        if usage is None:
+            return
+        await self.event_bus.emit(
+            TaskUsageEvent(
+                agent_id=agent_id,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                requests=usage.requests,
+                cost=usage.cost,
+            )
+        )
 
     async def handle_task_create(self, event: TaskCreateEvent) -> None:
+        self.event_bus.open_cancellation_token(event.agent_id, event.deadline)
+        if event.session_context is not None:
+            await self.add_session_context(event.agent_id, event.session_context)
         await self.event_bus.emit(
             AgentCreateEvent(
                 agent_id=event.agent_id,
@@ -183,42 +332,34 @@ class AgentRuntime(RuntimeType):
         )
 
     async def handle_agent_create(self, event: AgentCreateEvent) -> None:
-        async with self._agents_lock:
-            if event.agent_id in self.agents:
-                error_event = AgentRuntimeErrorEvent(
+        if event.agent_id in self.agents:
+            await self.event_bus.emit(
+                AgentRuntimeErrorEvent(
                     agent_id=event.agent_id,
                     error="Agent with this ID already exists.",
                 )
-                agent = None
-            else:
-                if is_primary_agent(event.agent_id):
-                    session = self.primary_agent_conversation_session.create(
-                        self.session_context.get(event.agent_id, {})
-                    )
-                else:
-                    session = self.sub_agent_conversation_session.create()
-                agent = Agent(
-                    agent_id=event.agent_id,
-                    system_prompt=event.system_prompt,
-                    event_bus=self.event_bus,
-                    tool_schemas=event.tool_schemas,
-                    conversation_session=session,
-                )
-                self.agents[event.agent_id] = agent
-                error_event = None
-
-        if error_event is not None:
-            await self.event_bus.emit(error_event)
-            return
-
-        if agent is None:
+            )
             return
-
+        if is_primary_agent(event.agent_id):
+            session = self.primary_agent_conversation_session.create(
+                self.session_context.get(event.agent_id, {})
+            )
+        else:
+            session = self.sub_agent_conversation_session.create()
+        agent = Agent(
+            agent_id=event.agent_id,
+            system_prompt=event.system_prompt,
+            event_bus=self.event_bus,
+            tool_schemas=event.tool_schemas,
+            conversation_session=session,
+            conversation_processors=self.conversation_processors,
+            usage=self.usage,
+        )
+        self._add_agent(agent)
         await agent.start(event.task)
 
     async def handle_llm_response(self, event: LLMResponseEvent) -> None:
-        async with self._agents_lock:
-            agent = self.agents.get(event.agent_id)
+        agent = self.agents.get(event.agent_id)
         if not agent:
             if event.agent_id in self._cancelled_agents:
                 self._cancelled_agents.discard(event.agent_id)
@@ -234,8 +375,7 @@ class AgentRuntime(RuntimeType):
         await agent.handle_llm_response(event.response)
 
     async def handle_tools_exec_results(self, event: ToolsExecResultsEvent) -> None:
-        async with self._agents_lock:
-            agent = self.agents.get(event.agent_id)
+        agent = self.agents.get(event.agent_id)
         if not agent:
             if event.agent_id in self._cancelled_agents:
                 self._cancelled_agents.discard(event.agent_id)
@@ -250,78 +390,58 @@ class AgentRuntime(RuntimeType):
         await agent.handle_tools_exec_results(event.tool_results)
 
     async def handle_agent_finish(self, event: AgentFinishEvent) -> None:
-        events_to_emit: list[
-            AgentDeletedEvent | TaskFinishEvent | AgentRuntimeErrorEvent
-        ] = []
-        async with self._agents_lock:
-            if event.agent_id in self.agents:
-                await self.agents[event.agent_id].close()
-                del self.agents[event.agent_id]
-                events_to_emit.append(AgentDeletedEvent(agent_id=event.agent_id))
-                if is_primary_agent(event.agent_id):
-                    events_to_emit.append(
-                        TaskFinishEvent(agent_id=event.agent_id, result=event.result)
-                    )
-            else:
-                events_to_emit.append(
-                    AgentRuntimeErrorEvent(
-                        agent_id=event.agent_id,
-                        error="Agent not found on finish.",
-                    )
+        agent = self._pop_agent(event.agent_id)
+        if agent is None:
+            await self.event_bus.emit(
+                AgentRuntimeErrorEvent(
+                    agent_id=event.agent_id,
+                    error="Agent not found on finish.",
                 )
-
-        for emit_event in events_to_emit:
-            await self.event_bus.emit(emit_event)
+            )
+            return
+        await agent.close()
+        await self.event_bus.emit(AgentDeletedEvent(agent_id=event.agent_id))
+        if is_primary_agent(event.agent_id):
+            await self._emit_task_usage(event.agent_id)
+            await self.event_bus.emit(
+                TaskFinishEvent(agent_id=event.agent_id, result=event.result)
+            )
 
     async def handle_agent_runtime_error(self, event: AgentRuntimeErrorEvent) -> None:
-        events_to_emit: list[AgentDeletedEvent | TaskFinishEvent]
-        events_to_emit = []
-        async with self._agents_lock:
-            if event.agent_id and event.agent_id in self.agents:
-                await self.agents[event.agent_id].close()
-                del self.agents[event.agent_id]
-                self.session_context.pop(event.agent_id, None)
-                events_to_emit.append(AgentDeletedEvent(agent_id=event.agent_id))
-        events_to_emit.append(
+        agent = self._pop_agent(event.agent_id) if event.agent_id else None
+        if agent is not None:
+            await agent.close()
+            await self.event_bus.emit(AgentDeletedEvent(agent_id=event.agent_id))
+        if event.agent_id:
+            await self._emit_task_usage(event.agent_id)
+        await self.event_bus.emit(
             TaskFinishEvent(
                 agent_id=event.agent_id or "unknown",
                 result=f"Agent encountered an error: {event.error}",
             )
         )
-        for emit_event in events_to_emit:
-            await self.event_bus.emit(emit_event)
 
     async def handle_launcher_shutdown(self, event: AgentLauncherShutdownEvent) -> None:
-        async with self._agents_lock:
-            agent_ids = list(self.agents.keys())
-            for agent in self.agents.values():
-                await agent.close()
-            self.agents.clear()
-            self.session_context.clear()
-        for agent_id in agent_ids:
+        agents = self.agents
+        self.agents = {}
+        self.task_agents.clear()
+        self.session_context.clear()
+        await asyncio.gather(*(agent.close() for agent in agents.values()))
+        for agent_id in agents:
             await self.event_bus.emit(AgentDeletedEvent(agent_id=agent_id))
 
     async def handle_task_finish(self, event: TaskFinishEvent) -> None:
-        should_emit_deleted = False
-        async with self._agents_lock:
-            if is_primary_agent(event.agent_id) and event.agent_id in self.agents:
-                await self.agents[event.agent_id].close()
-                del self.agents[event.agent_id]
-                self.session_context.pop(event.agent_id, None)
-                should_emit_deleted = True
-        if should_emit_deleted:
+        if not is_primary_agent(event.agent_id):
+            return
+        agent = self._pop_agent(event.agent_id)
+        if agent is not None:
+            await agent.close()
             await self.event_bus.emit(AgentDeletedEvent(agent_id=event.agent_id))
 
     async def handle_task_cancel(self, event: TaskCancelEvent) -> None:
-        to_delete: list[str] = []
-        async with self._agents_lock:
-            for agent_id in list(self.agents.keys()):
-                if get_primary_agent_id(agent_id) == event.agent_id:
-                    await self.agents[agent_id].close()
-                    del self.agents[agent_id]
-                    to_delete.append(agent_id)
-                    self.session_context.pop(agent_id, None)
-            self._cancelled_agents.update(to_delete)
-            self._cancelled_agents.add(event.agent_id)
-        for agent_id in to_delete:
+        agents = self._pop_task(event.agent_id)
+        self._cancelled_agents.update(agents)
+        self._cancelled_agents.add(event.agent_id)
+        await asyncio.gather(*(agent.close() for agent in agents.values()))
+        for agent_id in agents:
             await self.event_bus.emit(AgentDeletedEvent(agent_id=agent_id))
@@ -0,0 +1,312 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from agentlauncher.eventbus import EventContext, TokenCancelledError
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    LLMProcessor,
+    Message,
+    MessageView,
+    SystemMessage,
+    TokenEstimator,
+    ToolCallMessage,
+    ToolResultMessage,
+    UserMessage,
+    estimate_message_tokens,
+)
+
+type ConversationProcessor = Callable[
+    [
+        Sequence[Message],
+        EventContext,
+    ],
+    Awaitable[Sequence[Message]] | Sequence[Message],
+]
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You compress agent transcripts. Summarize the conversation below so the "
+    "agent can continue its task without it. Keep the task, decisions, facts "
+    "learned from tools, open questions and remaining steps. Reply with the "
+    "summary only."
+)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class ConversationCompactor(ABC):
+    @abstractmethod
+    def __call__(
+        self, messages: Sequence[Message], context: EventContext
+    ) -> Awaitable[Sequence[Message]] | Sequence[Message]: ...
+
+    def release(self, agent_id: str) -> None:
+        return None
+
+
+def system_prefix(messages: Sequence[Message]) -> int:
+    start = 0
+    while start < len(messages) and isinstance(messages[start], SystemMessage):
+        start += 1
+    return start
+
+
+def turn_start(messages: Sequence[Message], index: int) -> int:
+    while index < len(messages) and isinstance(messages[index], ToolResultMessage):
+        index += 1
+    return index
+
+
+class SlidingWindow(ConversationCompactor):
+    def __init__(
+        self,
+        max_messages: int | None = None,
+        max_tokens: int | None = None,
+        estimator: TokenEstimator = estimate_message_tokens,
+    ):
+        if max_messages is None and max_tokens is None:
+            raise ValueError("SlidingWindow needs max_messages or max_tokens.")
+        if max_messages is not None and max_messages <= 0:
+            raise ValueError("max_messages must be positive.")
+        if max_tokens is not None and max_tokens <= 0:
+            raise ValueError("max_tokens must be positive.")
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.estimator = estimator
+
+    def __call__(
+        self, messages: Sequence[Message], context: EventContext
+    ) -> Sequence[Message]:
+        head = system_prefix(messages)
+        start = head
+        if self.max_messages is not None:
+            start = max(start, len(messages) - self.max_messages)
+        if self.max_tokens is not None:
+            budget = self.max_tokens - sum(
+                self.estimator(message) for message in messages[:head]
+            )
+            index = len(messages)
+            while index > start:
+                budget -= self.estimator(messages[index - 1])
+                if budget < 0:
+                    break
+                index -= 1
+            start = index
+        if start == head:
+            return messages
+        start = turn_start(messages, start)
+        return [*messages[:head], *messages[start:]]
+
+
+@dataclass(slots=True)
+class _TruncationState:
+    source: MessageView
+    processed: list[Message]
+    truncated: int = 0
+
+
+class ToolResultTruncator(ConversationCompactor):
+    def __init__(self, max_chars: int = 8000, keep_ratio: float = 0.75):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive.")
+        if not 0.0 <= keep_ratio <= 1.0:
+            raise ValueError("keep_ratio must be between 0 and 1.")
+        self.max_chars = max_chars
+        self.keep_ratio = keep_ratio
+        self._states: dict[str, _TruncationState] = {}
+
+    def truncate(self, message: Message) -> Message:
+        if (
+            not isinstance(message, ToolResultMessage)
+            or len(message.result) <= self.max_chars
+        ):
+            return message
+        result = message.result
+        head = int(self.max_chars * self.keep_ratio)
+        tail = self.max_chars - head
+        omitted = len(result) - head - tail
+        return ToolResultMessage(
+            tool_call_id=message.tool_call_id,
+            tool_name=message.tool_name,
+            result=(
+                f"{result[:head]}\n... [{omitted} characters truncated] ...\n"
+                f"{result[len(result) - tail :] if tail else ''}"
+            ),
+        )
+
+    def __call__(
+        self, messages: Sequence[Message], context: EventContext
+    ) -> Sequence[Message]:
+        state = self._states.get(context.agent_id)
+        if state is not None and not state.source.is_prefix_of(messages):
+            state = None
+        done = 0 if state is None else len(state.processed)
+        if done < len(messages):
+            new = [self.truncate(message) for message in messages[done:]]
+            truncated = sum(
+                result is not message
+                for message, result in zip(messages[done:], new, strict=True)
+            )
+            source = MessageView.snapshot(messages)
+            if state is None:
+                state = self._states[context.agent_id] = _TruncationState(
+                    source, new, truncated
+                )
+            else:
+                state.processed.extend(new)
+                state.source = source
+                state.truncated += truncated
+        if state is None or not state.truncated:
+            return messages
+        return MessageView(state.processed)
+
+    def release(self, agent_id: str) -> None:
+        self._states.pop(agent_id, None)
+
+
+@dataclass(slots=True)
+class _Summary:
+    covered: int
+    last_covered: Message
+    message: UserMessage
+
+
+class TurnSummarizer(ConversationCompactor):
+    def __init__(
+        self,
+        max_tokens: int,
+        keep_tokens: int | None = None,
+        llm_processor: LLMProcessor | None = None,
+        estimator: TokenEstimator = estimate_message_tokens,
+        prompt: str = SUMMARY_SYSTEM_PROMPT,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive.")
+        keep_tokens = max_tokens // 4 if keep_tokens is None else keep_tokens
+        if not 0 <= keep_tokens < max_tokens:
+            raise ValueError("keep_tokens must be between 0 and max_tokens.")
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens
+        self.llm_processor = llm_processor
+        self.fallback_llm_processor: Callable[[], LLMProcessor | None] | None = None
+        self.estimator = estimator
+        self.prompt = prompt
+        self._summaries: dict[str, _Summary] = {}
+        self._logger = logging.getLogger(__name__)
+
+    def _resolve_processor(self) -> LLMProcessor | None:
+        if self.llm_processor is not None:
+            return self.llm_processor
+        if self.fallback_llm_processor is not None:
+            return self.fallback_llm_processor()
+        return None
+
+    def _cached(
+        self, agent_id: str, messages: Sequence[Message], head: int
+    ) -> _Summary | None:
+        summary = self._summaries.get(agent_id)
+        if summary is None:
+            return None
+        end = head + summary.covered
+        if end <= len(messages) and messages[end - 1] is summary.last_covered:
+            return summary
+        del self._summaries[agent_id]
+        return None
+
+    async def __call__(
+        self, messages: Sequence[Message], context: EventContext
+    ) -> Sequence[Message]:
+        head = system_prefix(messages)
+        summary = self._cached(context.agent_id, messages, head)
+        start = head + (summary.covered if summary is not None else 0)
+        tokens = sum(self.estimator(message) for message in messages[:head])
+        if summary is not None:
+            tokens += self.estimator(summary.message)
+        tail_tokens = [self.estimator(message) for message in messages[start:]]
+        if tokens + sum(tail_tokens) > self.max_tokens:
+            cut = len(messages)
+            kept = 0
+            while cut > start and kept + tail_tokens[cut - 1 - start] <= (
+                self.keep_tokens
+            ):
+                kept += tail_tokens[cut - 1 - start]
+                cut -= 1
+            cut = turn_start(messages, cut)
+            if cut > start:
+                summary = await self._summarize(
+                    messages, head, start, cut, summary, context
+                )
+        if summary is None:
+            return messages
+        return [
+            *messages[:head],
+            summary.message,
+            *messages[head + summary.covered :],
+        ]
+
+    async def _summarize(
+        self,
+        messages: Sequence[Message],
+        head: int,
+        start: int,
+        cut: int,
+        summary: _Summary | None,
+        context: EventContext,
+    ) -> _Summary | None:
+        processor = self._resolve_processor()
+        if processor is None:
+            return summary
+        lines = [] if summary is None else [summary.message.content]
+        lines.extend(render_message(message) for message in messages[start:cut])
+        request: list[Message] = [
+            SystemMessage(content=self.prompt),
+            UserMessage(content="\n".join(lines)),
+        ]
+        try:
+            if asyncio.iscoroutinefunction(processor):
+                response = await context.cancel_token.run(
+                    processor(request, [], context)
+                )
+            else:
+                response = await context.cancel_token.run(
+                    asyncio.to_thread(processor, request, [], context)
+                )
+        except TokenCancelledError:
+            raise
+        except Exception:
+            self._logger.exception("[%s] Conversation summary failed", context.agent_id)
+            return summary
+        text = "\n".join(
+            message.content
+            for message in response
+            if isinstance(message, AssistantMessage)
+        ).strip()
+        if not text:
+            return summary
+        summary = _Summary(
+            covered=cut - head,
+            last_covered=messages[cut - 1],
+            message=UserMessage(content=SUMMARY_PREFIX + text),
+        )
+        self._summaries[context.agent_id] = summary
+        return summary
+
+    def release(self, agent_id: str) -> None:
+        self._summaries.pop(agent_id, None)
+
+
+def render_message(message: Message) -> str:
+    match message:
+        case UserMessage(content=content):
+            return f"user: {content}"
+        case AssistantMessage(content=content):
+            return f"assistant: {content}"
+        case SystemMessage(content=content):
+            return f"system: {content}"
+        case ToolCallMessage(tool_name=name, arguments=arguments):
+            return f"tool call {name}: {arguments}"
+        case ToolResultMessage(tool_name=name, result=result):
+            return f"tool result {name}: {result}"
+    return str(message)
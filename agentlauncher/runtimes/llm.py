@@ -1,7 +1,8 @@
 import asyncio
+import time
 from typing import cast
 
-from agentlauncher.eventbus import EventBus, EventContext
+from agentlauncher.eventbus import EventBus, EventContext, TokenCancelledError
 from agentlauncher.events import (
     LLMRequestEvent,
     LLMResponseEvent,
@@ -12,8 +13,9 @@ from agentlauncher.llm_interface.message import (
     AssistantMessage,
     ResponseMessageList,
 )
-from agentlauncher.shared import is_primary_agent
+from agentlauncher.shared import AgentId
 
+from .recording import RecordedResponses
 from .type import RuntimeType
 
 
@@ -21,23 +23,59 @@ class LLMRuntime(RuntimeType):
     def __init__(
         self,
         event_bus: EventBus,
+        min_request_budget: float = 0.0,
     ):
         super().__init__(event_bus)
+        self.min_request_budget = min_request_budget
         self._primary_agent_llm_processor: LLMProcessor | None = None
         self._sub_agent_llm_processor: LLMProcessor | None = None
+        self.recorded: dict[str, RecordedResponses] = {}
         self.event_bus.subscribe(LLMRequestEvent, self.handle_llm_request)
         self.event_bus.subscribe(LLMRuntimeErrorEvent, self.handle_llm_runtime_error)
 
+    @property
+    def primary_agent_llm_processor(self) -> LLMProcessor | None:
+        return self._primary_agent_llm_processor
+
+    @property
+    def sub_agent_llm_processor(self) -> LLMProcessor | None:
+        return self._sub_agent_llm_processor
+
     def set_primary_agent_llm_processor(self, processor: LLMProcessor) -> None:
         self._primary_agent_llm_processor = processor
 
     def set_sub_agent_llm_processor(self, processor: LLMProcessor) -> None:
         self._sub_agent_llm_processor = processor
 
+    def has_budget(self, deadline: float | None) -> bool:
+        return deadline is None or deadline - time.monotonic() > self.min_request_budget
+
     async def handle_llm_request(self, event: LLMRequestEvent) -> None:
+        if not self.has_budget(event.deadline):
+            await self.event_bus.emit(
+                LLMRuntimeErrorEvent(
+                    agent_id=event.agent_id,
+                    error="Deadline budget exhausted.",
+                    request_event=event,
+                )
+            )
+            return
+        recorded = self.recorded.get(self.event_bus.primary_agent_id(event.agent_id))
+        if recorded is not None:
+            response = recorded.llm_response(event.messages)
+            if response is not None:
+                await self.event_bus.emit(
+                    LLMResponseEvent(
+                        agent_id=event.agent_id,
+                        request_event=event,
+                        response=response,
+                    )
+                )
+                return
         handler = (
             self._primary_agent_llm_processor
-            if is_primary_agent(event.agent_id) or not self._sub_agent_llm_processor
+            if AgentId.of(event.agent_id).is_primary
+            or not self._sub_agent_llm_processor
             else self._sub_agent_llm_processor
         )
         if not handler:
@@ -52,13 +90,17 @@ class LLMRuntime(RuntimeType):
         try:
             context = EventContext(agent_id=event.agent_id, event_bus=self.event_bus)
             if asyncio.iscoroutinefunction(handler):
-                response = await handler(event.messages, event.tool_schemas, context)
+                response = await context.cancel_token.run(
+                    handler(event.messages, event.tool_schemas, context)
+                )
             else:
-                response = await asyncio.to_thread(
-                    handler,
-                    event.messages,
-                    event.tool_schemas,
-                    context,
+                response = await context.cancel_token.run(
+                    asyncio.to_thread(
+                        handler,
+                        event.messages,
+                        event.tool_schemas,
+                        context,
+                    )
                 )
             await self.event_bus.emit(
                 LLMResponseEvent(
@@ -67,6 +109,8 @@ class LLMRuntime(RuntimeType):
                     response=cast(ResponseMessageList, response),
                 )
             )
+        except TokenCancelledError:
+            return
         except Exception as e:
             await self.event_bus.emit(
                 LLMRuntimeErrorEvent(
@@ -75,13 +119,18 @@ class LLMRuntime(RuntimeType):
             )
 
     async def handle_llm_runtime_error(self, event: LLMRuntimeErrorEvent) -> None:
-        if event.request_event.retry_count < 5:
+        if self.event_bus.cancellation_token(event.agent_id).cancelled:
+            return
+        if event.request_event.retry_count < 5 and self.has_budget(
+            event.request_event.deadline
+        ):
             await self.event_bus.emit(
                 LLMRequestEvent(
                     agent_id=event.request_event.agent_id,
                     messages=event.request_event.messages,
                     tool_schemas=event.request_event.tool_schemas,
                     retry_count=event.request_event.retry_count + 1,
+                    deadline=event.request_event.deadline,
                 )
             )
         else:
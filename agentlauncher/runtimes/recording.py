@@ -0,0 +1,52 @@
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+from agentlauncher.eventbus import EventType
+from agentlauncher.events import LLMResponseEvent, ToolsExecResultsEvent
+from agentlauncher.llm_interface import AssistantMessage, Message, ToolCallMessage
+
+type RecordedResponse = Sequence[AssistantMessage | ToolCallMessage]
+
+
+def request_key(messages: Sequence[Message]) -> tuple[str, ...]:
+    return tuple(repr(message) for message in messages)
+
+
+class RecordedResponses:
+    def __init__(self) -> None:
+        self.llm_responses: dict[tuple[str, ...], deque[RecordedResponse]] = {}
+        self.tool_results: dict[str, str] = {}
+
+    @classmethod
+    def from_events(cls, events: Iterable[EventType]) -> "RecordedResponses":
+        recorded = cls()
+        for event in events:
+            recorded.add(event)
+        return recorded
+
+    def __len__(self) -> int:
+        return sum(map(len, self.llm_responses.values())) + len(self.tool_results)
+
+    def add(self, event: EventType) -> None:
+        if isinstance(event, LLMResponseEvent):
+            key = request_key(event.request_event.messages)
+            responses = self.llm_responses.get(key)
+            if responses is None:
+                responses = self.llm_responses[key] = deque()
+            responses.append(event.response)
+        elif isinstance(event, ToolsExecResultsEvent):
+            for result in event.tool_results:
+                self.tool_results[result.tool_call_id] = result.result
+
+    def llm_response(self, messages: Sequence[Message]) -> RecordedResponse | None:
+        key = request_key(messages)
+        responses = self.llm_responses.get(key)
+        if responses is None:
+            return None
+        response = responses.popleft()
+        if not responses:
+            del self.llm_responses[key]
+        return response
+
+    def tool_result(self, tool_call_id: str) -> str | None:
+        return self.tool_results.pop(tool_call_id, None)
@@ -1,12 +1,15 @@
 import asyncio
-from collections.abc import Awaitable, Callable
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, cast
 
 from agentlauncher.eventbus import EventBus, EventContext
 from agentlauncher.events import (
     AgentFinishEvent,
     TaskCancelEvent,
+    ToolCall,
     ToolExecErrorEvent,
     ToolExecFinishEvent,
     ToolExecStartEvent,
@@ -19,18 +22,47 @@ from agentlauncher.events.agent import AgentCreateEvent
 from agentlauncher.llm_interface import ToolParamSchema, ToolSchema
 from agentlauncher.shared import (
     CREATE_SUB_AGENT_TOOL_NAME,
+    AgentId,
     generate_sub_agent_id,
-    get_primary_agent_id,
 )
 
+from .recording import RecordedResponses
 from .type import RuntimeType
 
 
-@dataclass
+@dataclass(slots=True)
 class Tool(ToolSchema):
     function: Callable[..., str | Awaitable[str]]
     context_key: str | None = None
 
+    def __reduce__(self):
+        return (ToolSchema, (self.name, self.description, self.parameters))
+
+
+@dataclass(frozen=True, slots=True)
+class ToolRegistry:
+    version: int
+    tools: Mapping[str, Tool]
+    schemas: list[ToolSchema]
+    positions: Mapping[str, int]
+
+    @classmethod
+    def build(cls, version: int, tools: dict[str, Tool]) -> "ToolRegistry":
+        return cls(
+            version=version,
+            tools=MappingProxyType(tools),
+            schemas=list(tools.values()),
+            positions=MappingProxyType({name: i for i, name in enumerate(tools)}),
+        )
+
+    def select(self, tool_names: Iterable[str]) -> list[ToolSchema]:
+        selected = sorted(
+            {self.positions[name] for name in tool_names if name in self.positions}
+        )
+        if len(selected) == len(self.schemas):
+            return self.schemas
+        return [self.schemas[i] for i in selected]
+
 
 class ToolRuntime(RuntimeType):
     def __init__(
@@ -39,18 +71,32 @@ class ToolRuntime(RuntimeType):
         sub_agent_tool: bool = True,
     ):
         super().__init__(event_bus)
-        self.tools: dict[str, Tool] = {}
+        self._registered: dict[str, Tool] = {}
         self.enable_sub_agent_tool = sub_agent_tool
+        self.registry = self._build_registry(0)
         self.event_bus.subscribe(ToolsExecRequestEvent, self.handle_tools_exec_request)
         self.event_bus.subscribe(AgentFinishEvent, self.handle_agent_finish)
         self.event_bus.subscribe(ToolRuntimeErrorEvent, self.handle_tool_runtime_error)
         self.event_bus.subscribe(TaskCancelEvent, self.handle_task_cancel)
         self.sub_agent_futures: dict[str, asyncio.Future[str]] = {}
+        self.recorded: dict[str, RecordedResponses] = {}
 
-    def setup_sub_agent_tool(self) -> None:
-        if not self.enable_sub_agent_tool or CREATE_SUB_AGENT_TOOL_NAME in self.tools:
-            return
-        self.tools[CREATE_SUB_AGENT_TOOL_NAME] = Tool(
+    @property
+    def tools(self) -> Mapping[str, Tool]:
+        return self.registry.tools
+
+    @property
+    def registered_tools(self) -> Mapping[str, Tool]:
+        return MappingProxyType(self._registered)
+
+    def _build_registry(self, version: int) -> ToolRegistry:
+        tools = dict(self._registered)
+        if self.enable_sub_agent_tool and CREATE_SUB_AGENT_TOOL_NAME not in tools:
+            tools[CREATE_SUB_AGENT_TOOL_NAME] = self._sub_agent_tool(list(tools))
+        return ToolRegistry.build(version, tools)
+
+    def _sub_agent_tool(self, tool_names: list[str]) -> Tool:
+        return Tool(
             name=CREATE_SUB_AGENT_TOOL_NAME,
             function=self._create_sub_agent_tool,
             description="Create a sub-agent to handle a specific task.",
@@ -65,7 +111,7 @@ class ToolRuntime(RuntimeType):
                     items={"type": "string"},
                     description="List of tool names that the sub-agent can use, "
                     "the tool names are from your tool list."
-                    f"available tools are: {', '.join(self.tools.keys())}",
+                    f"available tools are: {', '.join(tool_names)}",
                     required=True,
                 ),
             },
@@ -85,6 +131,7 @@ class ToolRuntime(RuntimeType):
         agent_id = generate_sub_agent_id(context.agent_id)
         future = asyncio.get_event_loop().create_future()
         self.sub_agent_futures[agent_id] = future
+        self.event_bus.register_sub_agent(agent_id, context.agent_id)
 
         await self.event_bus.emit(
             AgentCreateEvent(
@@ -95,10 +142,11 @@ class ToolRuntime(RuntimeType):
         )
 
         try:
-            result = await future
+            async with self.event_bus.blocking():
+                result = await future
             return result
         finally:
-            del self.sub_agent_futures[agent_id]
+            self.sub_agent_futures.pop(agent_id, None)
 
     def register(
         self,
@@ -108,16 +156,26 @@ class ToolRuntime(RuntimeType):
         parameters: dict[str, ToolParamSchema],
         context_key: str | None = None,
     ):
-        if name in self.tools:
-            raise ValueError(f"Tool '{name}' is already registered.")
-        tool = Tool(
-            name=name,
-            function=function,
-            description=description,
-            parameters=parameters,
-            context_key=context_key,
+        self.register_tools(
+            [
+                Tool(
+                    name=name,
+                    function=function,
+                    description=description,
+                    parameters=parameters,
+                    context_key=context_key,
+                )
+            ]
         )
-        self.tools[name] = tool
+
+    def register_tools(self, tools: Iterable[Tool]) -> None:
+        added: dict[str, Tool] = {}
+        for tool in tools:
+            if tool.name in self._registered or tool.name in added:
+                raise ValueError(f"Tool '{tool.name}' is already registered.")
+            added[tool.name] = tool
+        self._registered.update(added)
+        self.registry = self._build_registry(self.registry.version + 1)
 
     async def tool_exec(
         self,
@@ -126,6 +184,7 @@ class ToolRuntime(RuntimeType):
         agent_id: str,
         tool_call_id: str,
         context: EventContext,
+        tools: Mapping[str, Tool] | None = None,
     ) -> str:
         await self.event_bus.emit(
             ToolExecStartEvent(
@@ -136,13 +195,15 @@ class ToolRuntime(RuntimeType):
             )
         )
         try:
-            tool = self.tools[tool_name]
+            tool = (self.tools if tools is None else tools)[tool_name]
             if tool.context_key:
                 arguments[tool.context_key] = context
             if asyncio.iscoroutinefunction(tool.function):
-                result = await tool.function(**arguments)
+                result = await context.cancel_token.run(tool.function(**arguments))
             else:
-                result = await asyncio.to_thread(tool.function, **arguments)
+                result = await context.cancel_token.run(
+                    asyncio.to_thread(tool.function, **arguments)
+                )
 
             await self.event_bus.emit(
                 ToolExecFinishEvent(
@@ -165,8 +226,14 @@ class ToolRuntime(RuntimeType):
             return f"Error executing tool '{tool_name}': {e}"
 
     async def handle_tools_exec_request(self, event: ToolsExecRequestEvent) -> None:
+        token = self.event_bus.cancellation_token(event.agent_id)
+        if token.cancelled or (
+            event.deadline is not None and time.monotonic() >= event.deadline
+        ):
+            return
+        tools = self.tools
         missing_tools = [
-            tc.tool_name for tc in event.tool_calls if tc.tool_name not in self.tools
+            tc.tool_name for tc in event.tool_calls if tc.tool_name not in tools
         ]
         if missing_tools:
             await self.event_bus.emit(
@@ -177,18 +244,15 @@ class ToolRuntime(RuntimeType):
             )
             return
 
+        recorded = self.recorded.get(self.event_bus.primary_agent_id(event.agent_id))
         tasks = [
-            self.tool_exec(
-                tool_name=tool_call.tool_name,
-                arguments=tool_call.arguments.copy(),
-                agent_id=event.agent_id,
-                tool_call_id=tool_call.tool_call_id,
-                context=EventContext(agent_id=event.agent_id, event_bus=self.event_bus),
-            )
+            self._exec_tool_call(tool_call, event.agent_id, tools, recorded)
             for tool_call in event.tool_calls
         ]
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        if token.cancelled:
+            return
 
         tool_results = []
         for tool_call, result in zip(event.tool_calls, results, strict=False):
@@ -208,8 +272,28 @@ class ToolRuntime(RuntimeType):
             )
         )
 
-    def get_tool_schemas(self, tool_names: list[str]) -> list[ToolSchema]:
-        return [tool for name, tool in self.tools.items() if name in tool_names]
+    async def _exec_tool_call(
+        self,
+        tool_call: ToolCall,
+        agent_id: str,
+        tools: Mapping[str, Tool],
+        recorded: RecordedResponses | None,
+    ) -> str:
+        if recorded is not None:
+            result = recorded.tool_result(tool_call.tool_call_id)
+            if result is not None:
+                return result
+        return await self.tool_exec(
+            tool_name=tool_call.tool_name,
+            arguments=tool_call.arguments.copy(),
+            agent_id=agent_id,
+            tool_call_id=tool_call.tool_call_id,
+            context=EventContext(agent_id=agent_id, event_bus=self.event_bus),
+            tools=tools,
+        )
+
+    def get_tool_schemas(self, tool_names: Iterable[str]) -> list[ToolSchema]:
+        return self.registry.select(tool_names)
 
     async def handle_tool_runtime_error(self, event: ToolRuntimeErrorEvent) -> None:
         await self.event_bus.emit(
@@ -222,7 +306,7 @@ class ToolRuntime(RuntimeType):
     async def handle_task_cancel(self, event: TaskCancelEvent) -> None:
         to_cancel: list[str] = []
         for agent_id in list(self.sub_agent_futures.keys()):
-            if get_primary_agent_id(agent_id) == event.agent_id:
+            if AgentId.of(agent_id).primary == event.agent_id:
                 to_cancel.append(agent_id)
 
         for agent_id in to_cancel:
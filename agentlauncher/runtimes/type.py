@@ -1,6 +1,7 @@
+from collections.abc import Mapping
 from typing import Any
 
-from agentlauncher.eventbus import EventBus, EventHandler, EventType
+from agentlauncher.eventbus import EventBus, EventHandler, EventMatcher, EventType
 
 
 class RuntimeType:
@@ -8,6 +9,20 @@ class RuntimeType:
         self.event_bus = event_bus
 
     def subscribe(
-        self, event_type: type[EventType], handler: EventHandler[Any]
+        self,
+        event_type: type[EventType],
+        handler: EventHandler[Any],
+        *,
+        priority: int = 0,
+        ordered: bool = False,
+        agent_prefix: str | None = None,
+        where: Mapping[str, Any] | EventMatcher | None = None,
     ) -> None:
-        self.event_bus.subscribe(event_type, handler)
+        self.event_bus.subscribe(
+            event_type,
+            handler,
+            priority=priority,
+            ordered=ordered,
+            agent_prefix=agent_prefix,
+            where=where,
+        )
@@ -0,0 +1,176 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from agentlauncher.eventbus import EventBus
+from agentlauncher.events import (
+    AgentDeletedEvent,
+    AgentLauncherShutdownEvent,
+    LLMRequestEvent,
+    LLMResponseEvent,
+    TaskCancelEvent,
+    TaskFinishEvent,
+)
+from agentlauncher.llm_interface import (
+    Message,
+    MessageView,
+    TokenEstimator,
+    estimate_message_tokens,
+)
+
+from .type import RuntimeType
+
+BUDGET_SUMMARY_PROMPT = (
+    "The token budget for this task is used up and no more tools can be called. "
+    "Summarize what you have done so far, what you found, and what is left to do."
+)
+
+
+@dataclass(slots=True)
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    requests: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass(slots=True)
+class TokenBudget:
+    max_tokens: int | None = None
+    max_prompt_tokens: int | None = None
+    max_completion_tokens: int | None = None
+    max_cost: float | None = None
+    prompt_cost_per_1k: float = 0.0
+    completion_cost_per_1k: float = 0.0
+    summarize: bool = True
+
+    def exceeded(self, usage: TokenUsage) -> str | None:
+        if self.max_tokens is not None and usage.total_tokens > self.max_tokens:
+            return (
+                f"Token budget exceeded: {usage.total_tokens} of "
+                f"{self.max_tokens} tokens used."
+            )
+        if (
+            self.max_prompt_tokens is not None
+            and usage.prompt_tokens > self.max_prompt_tokens
+        ):
+            return (
+                f"Prompt token budget exceeded: {usage.prompt_tokens} of "
+                f"{self.max_prompt_tokens} tokens used."
+            )
+        if (
+            self.max_completion_tokens is not None
+            and usage.completion_tokens > self.max_completion_tokens
+        ):
+            return (
+                f"Completion token budget exceeded: {usage.completion_tokens} of "
+                f"{self.max_completion_tokens} tokens used."
+            )
+        if self.max_cost is not None and usage.cost > self.max_cost:
+            return f"Cost budget exceeded: {usage.cost:.4f} of {self.max_cost:.4f}."
+        return None
+
+
+@dataclass(slots=True)
+class _PromptPrefix:
+    source: MessageView
+    tokens: int
+
+
+class UsageRuntime(RuntimeType):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        budget: TokenBudget | None = None,
+        estimator: TokenEstimator = estimate_message_tokens,
+    ):
+        super().__init__(event_bus)
+        self.budget = budget
+        self.estimator = estimator
+        self.agents: dict[str, TokenUsage] = {}
+        self.tasks: dict[str, TokenUsage] = {}
+        self._prefixes: dict[str, _PromptPrefix] = {}
+        self.subscribe(LLMRequestEvent, self.handle_llm_request)
+        self.subscribe(LLMResponseEvent, self.handle_llm_response)
+        self.subscribe(AgentDeletedEvent, self.handle_agent_deleted)
+        self.subscribe(TaskFinishEvent, self.handle_task_finish)
+        self.subscribe(TaskCancelEvent, self.handle_task_cancel)
+        self.subscribe(AgentLauncherShutdownEvent, self.handle_launcher_shutdown)
+
+    def agent_usage(self, agent_id: str) -> TokenUsage:
+        return self.agents.get(agent_id) or TokenUsage()
+
+    def task_usage(self, agent_id: str) -> TokenUsage:
+        primary = self.event_bus.primary_agent_id(agent_id)
+        return self.tasks.get(primary) or TokenUsage()
+
+    def exceeded(self, agent_id: str) -> str | None:
+        if self.budget is None:
+            return None
+        usage = self.tasks.get(self.event_bus.primary_agent_id(agent_id))
+        return None if usage is None else self.budget.exceeded(usage)
+
+    def prompt_tokens(self, agent_id: str, messages: Sequence[Message]) -> int:
+        prefix = self._prefixes.get(agent_id)
+        start = tokens = 0
+        if prefix is not None and prefix.source.is_prefix_of(messages):
+            start, tokens = len(prefix.source), prefix.tokens
+        tokens += sum(self.estimator(message) for message in messages[start:])
+        if messages:
+            self._prefixes[agent_id] = _PromptPrefix(
+                MessageView.snapshot(messages), tokens
+            )
+        return tokens
+
+    def pop_task(self, agent_id: str) -> TokenUsage | None:
+        return self.tasks.pop(agent_id, None)
+
+    def _record(
+        self, agent_id: str, prompt_tokens: int, completion_tokens: int, requests: int
+    ) -> None:
+        cost = 0.0
+        if self.budget is not None:
+            cost = (
+                prompt_tokens * self.budget.prompt_cost_per_1k
+                + completion_tokens * self.budget.completion_cost_per_1k
+            ) / 1000
+        primary = self.event_bus.primary_agent_id(agent_id)
+        for key, usages in ((agent_id, self.agents), (primary, self.tasks)):
+            usage = usages.get(key)
+            if usage is None:
+                usage = usages[key] = TokenUsage()
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.requests += requests
+            usage.cost += cost
+
+    def handle_llm_request(self, event: LLMRequestEvent) -> None:
+        self._record(
+            event.agent_id, self.prompt_tokens(event.agent_id, event.messages), 0, 1
+        )
+
+    def handle_llm_response(self, event: LLMResponseEvent) -> None:
+        self._record(
+            event.agent_id,
+            0,
+            sum(self.estimator(message) for message in event.response),
+            0,
+        )
+
+    def handle_agent_deleted(self, event: AgentDeletedEvent) -> None:
+        self.agents.pop(event.agent_id, None)
+        self._prefixes.pop(event.agent_id, None)
+
+    def handle_task_finish(self, event: TaskFinishEvent) -> None:
+        self.tasks.pop(event.agent_id, None)
+
+    def handle_task_cancel(self, event: TaskCancelEvent) -> None:
+        self.tasks.pop(event.agent_id, None)
+
+    def handle_launcher_shutdown(self, event: AgentLauncherShutdownEvent) -> None:
+        self.agents.clear()
+        self.tasks.clear()
+        self._prefixes.clear()
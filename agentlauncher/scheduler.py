@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from agentlauncher.session import SessionContext
+
+
+@dataclass
+class SchedulerStats:
+    active: int
+    max_active: int
+    queued: dict[int, int]
+    admitted: dict[int, int]
+    mean_wait: dict[int, float]
+    max_wait: dict[int, float]
+
+
+@dataclass(slots=True)
+class _Ticket:
+    agent_id: str
+    priority: int
+    tenant: str
+    enqueued_at: float
+    future: asyncio.Future[None]
+
+
+@dataclass(slots=True)
+class _PriorityClass:
+    heap: list[tuple[float, int, _Ticket]] = field(default_factory=list)
+    finish: dict[str, float] = field(default_factory=dict)
+    virtual_time: float = 0.0
+    queued: int = 0
+    admitted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class AdmissionScheduler:
+    def __init__(
+        self,
+        max_active: int,
+        tenant_key: str = "tenant",
+        tenant_weights: Mapping[str, float] | None = None,
+        default_weight: float = 1.0,
+    ):
+        if max_active <= 0:
+            raise ValueError("max_active must be positive.")
+        if default_weight <= 0:
+            raise ValueError("default_weight must be positive.")
+        self.max_active = max_active
+        self.tenant_key = tenant_key
+        self.tenant_weights = dict(tenant_weights or {})
+        self.default_weight = default_weight
+        self._active: set[str] = set()
+        self._classes: dict[int, _PriorityClass] = {}
+        self._order: list[int] = []
+        self._tickets: dict[str, _Ticket] = {}
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        return len(self._active)
+
+    @property
+    def queued(self) -> int:
+        return len(self._tickets)
+
+    @property
+    def stats(self) -> SchedulerStats:
+        return SchedulerStats(
+            active=len(self._active),
+            max_active=self.max_active,
+            queued={p: c.queued for p, c in self._classes.items()},
+            admitted={p: c.admitted for p, c in self._classes.items()},
+            mean_wait={
+                p: c.total_wait / c.admitted if c.admitted else 0.0
+                for p, c in self._classes.items()
+            },
+            max_wait={p: c.max_wait for p, c in self._classes.items()},
+        )
+
+    def tenant_of(self, session_context: SessionContext | None) -> str:
+        if not session_context:
+            return ""
+        return str(session_context.get(self.tenant_key, ""))
+
+    async def acquire(self, agent_id: str, priority: int = 0, tenant: str = "") -> None:
+        if agent_id in self._active or agent_id in self._tickets:
+            raise ValueError(f"Agent '{agent_id}' is already scheduled.")
+        queue = self._class(priority)
+        now = time.perf_counter()
+        if len(self._active) < self.max_active and not self._tickets:
+            self._active.add(agent_id)
+            self._record(queue, 0.0)
+            return
+        ticket = _Ticket(
+            agent_id,
+            priority,
+            tenant,
+            now,
+            asyncio.get_running_loop().create_future(),
+        )
+        weight = self.tenant_weights.get(tenant, self.default_weight)
+        finish = max(queue.virtual_time, queue.finish.get(tenant, 0.0)) + 1 / weight
+        queue.finish[tenant] = finish
+        heapq.heappush(queue.heap, (finish, next(self._sequence), ticket))
+        queue.queued += 1
+        self._tickets[agent_id] = ticket
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self.release(agent_id)
+            else:
+                self._discard(ticket)
+            raise
+
+    def release(self, agent_id: str) -> None:
+        if agent_id in self._active:
+            self._active.discard(agent_id)
+            self._admit()
+
+    def cancel(self, agent_id: str) -> None:
+        ticket = self._tickets.get(agent_id)
+        if ticket is not None:
+            self._discard(ticket)
+            ticket.future.cancel()
+
+    def _class(self, priority: int) -> _PriorityClass:
+        queue = self._classes.get(priority)
+        if queue is None:
+            queue = self._classes[priority] = _PriorityClass()
+            self._order = sorted(self._classes, reverse=True)
+        return queue
+
+    def _discard(self, ticket: _Ticket) -> None:
+        if self._tickets.pop(ticket.agent_id, None) is None:
+            return
+        queue = self._classes[ticket.priority]
+        queue.queued -= 1
+        if not queue.queued:
+            self._reset(queue)
+
+    def _admit(self) -> None:
+        while len(self._active) < self.max_active and self._tickets:
+            for priority in self._order:
+                queue = self._classes[priority]
+                if queue.queued:
+                    break
+            else:
+                return
+            finish, _, ticket = heapq.heappop(queue.heap)
+            if self._tickets.get(ticket.agent_id) is not ticket:
+                continue
+            del self._tickets[ticket.agent_id]
+            queue.queued -= 1
+            queue.virtual_time = finish
+            if not queue.queued:
+                self._reset(queue)
+            if ticket.future.done():
+                continue
+            self._active.add(ticket.agent_id)
+            self._record(queue, time.perf_counter() - ticket.enqueued_at)
+            ticket.future.set_result(None)
+
+    def _reset(self, queue: _PriorityClass) -> None:
+        queue.heap.clear()
+        queue.finish.clear()
+        queue.virtual_time = 0.0
+
+    def _record(self, queue: _PriorityClass, wait: float) -> None:
+        queue.admitted += 1
+        queue.total_wait += wait
+        if wait > queue.max_wait:
+            queue.max_wait = wait
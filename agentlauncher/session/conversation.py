@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Sequence
+from typing import Any, ClassVar
 
 from agentlauncher.llm_interface import Message
 
@@ -7,6 +8,8 @@ type SessionContext = dict[str, Any]
 
 
 class ConversationSession(ABC):
+    incremental: ClassVar[bool] = False
+
     @classmethod
     @abstractmethod
     def create(
@@ -14,7 +17,7 @@ class ConversationSession(ABC):
     ) -> "ConversationSession": ...
 
     @abstractmethod
-    async def load(self) -> list[Message]: ...
+    async def load(self) -> Sequence[Message]: ...
 
     @abstractmethod
     async def prepare_messages(
@@ -4,6 +4,8 @@ from .conversation import ConversationSession, SessionContext
 
 
 class InMemoryConversationSession(ConversationSession):
+    incremental = True
+
     def __init__(self) -> None:
         self.messages: list[Message] = []
 
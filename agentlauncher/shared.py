@@ -1,4 +1,10 @@
-import uuid
+import importlib
+import itertools
+import os
+import sys
+import weakref
+from collections.abc import Callable, Mapping
+from typing import Any, Self
 
 PRIMARY_AGENT_PREFIX = "agent"
 CREATE_SUB_AGENT_TOOL_NAME = "create_sub_agent"
@@ -26,22 +32,109 @@ Organize results for easy understanding, you don't need to report how you delega
 """
 
 
-def generate_primary_agent_id() -> str:
-    return f"{PRIMARY_AGENT_PREFIX}_{uuid.uuid4().hex[:8]}"
+class AgentId(str):
+    primary: "AgentId"
+    parent: "AgentId | None"
+    depth: int
+    is_primary: bool
 
+    @classmethod
+    def of(cls, value: str) -> Self:
+        if type(value) is cls:
+            return value
+        agent_id = _interned.get(value)
+        if agent_id is None:
+            agent_id = cls._create(value)
+        return agent_id
 
-def generate_sub_agent_id(primary_agent_id: str) -> str:
-    return f"{primary_agent_id}_{uuid.uuid4()}"
+    @classmethod
+    def _create(cls, value: str) -> Self:
+        parts = value.split("_")
+        if len(parts) < 2 or parts[0] != PRIMARY_AGENT_PREFIX or not parts[1]:
+            raise ValueError("Not a primary agent ID")
+        agent_id = super().__new__(cls, value)
+        agent_id.depth = len(parts) - 2
+        agent_id.is_primary = agent_id.depth == 0
+        if agent_id.is_primary:
+            agent_id.primary = agent_id
+            agent_id.parent = None
+        else:
+            agent_id.parent = cls.of(value.rsplit("_", 1)[0])
+            agent_id.primary = agent_id.parent.primary
+        _interned[value] = agent_id
+        return agent_id
 
+    def child(self) -> "AgentId":
+        return AgentId.of(f"{self}_{next(_sub_agent_counter):x}")
 
-def get_primary_agent_id(agent_id: str) -> str:
-    if not agent_id.startswith(f"{PRIMARY_AGENT_PREFIX}_"):
-        raise ValueError("Not a primary agent ID")
-    parts = agent_id.split("_", 2)
-    if len(parts) >= 2:
-        return f"{parts[0]}_{parts[1]}"
-    return agent_id
+    def __reduce__(self):
+        return (AgentId.of, (str(self),))
+
+
+_interned: weakref.WeakValueDictionary[str, AgentId] = weakref.WeakValueDictionary()
+_primary_agent_counter = itertools.count(1)
+_sub_agent_counter = itertools.count(1)
+_process_tag = os.urandom(3).hex()
+
+
+def _reset_process_tag() -> None:
+    global _process_tag
+    _process_tag = os.urandom(3).hex()
+
+
+os.register_at_fork(after_in_child=_reset_process_tag)
+
+
+def generate_primary_agent_id() -> AgentId:
+    return AgentId.of(
+        f"{PRIMARY_AGENT_PREFIX}_{_process_tag}{next(_primary_agent_counter):08x}"
+    )
+
+
+def generate_sub_agent_id(parent_agent_id: str) -> AgentId:
+    return AgentId.of(parent_agent_id).child()
+
+
+def get_primary_agent_id(agent_id: str) -> AgentId:
+    return AgentId.of(agent_id).primary
 
 
 def is_primary_agent(agent_id: str) -> bool:
-    return agent_id.startswith(f"{PRIMARY_AGENT_PREFIX}_") and agent_id.count("_") == 1
+    if type(agent_id) is AgentId:
+        return agent_id.is_primary
+    try:
+        return AgentId.of(agent_id).is_primary
+    except ValueError:
+        return False
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> Callable[[str], Any]:
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
+
+
+_event_loop_policy_installed = False
+
+
+def install_event_loop_policy() -> None:
+    global _event_loop_policy_installed
+    if _event_loop_policy_installed:
+        return
+    _event_loop_policy_installed = True
+    try:
+        import uvloop
+    except ImportError:
+        import logging
+
+        logging.warning("uvloop is not installed, using default asyncio event loop.")
+        return
+    import asyncio
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
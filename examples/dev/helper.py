@@ -243,6 +243,8 @@ def register_tools(launcher: AgentLauncher) -> None:
 
 
 class TestConversationSession(InMemoryConversationSession):
+    incremental = False
+
     @classmethod
     def create(cls, session_context=None) -> "TestConversationSession":
         return cls()
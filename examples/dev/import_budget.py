@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import time
+
+from agentlauncher import AgentLauncher
+
+IMPORT_BUDGETS_MS = {
+    "import agentlauncher": 25.0,
+    "from agentlauncher import AgentLauncher": 150.0,
+}
+CONSTRUCT_BUDGET_US = 500.0
+RUNS = 5
+
+
+def import_time_ms(statement: str) -> float:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    samples = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(RUNS)
+    ]
+    return min(samples) * 1000
+
+
+def construct_time_us(factory, count: int = 1000) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def main() -> int:
+    failed = False
+    for statement, budget in IMPORT_BUDGETS_MS.items():
+        elapsed = import_time_ms(statement)
+        failed |= elapsed > budget
+        print(f"{statement:<44}{elapsed:>8.1f} ms  (budget {budget:.0f} ms)")
+
+    template = AgentLauncher()
+    for i in range(200):
+        template.register_tool(f"tool_{i}", str, f"Tool {i}")
+    for label, factory in (
+        ("AgentLauncher()", AgentLauncher),
+        ("template.clone() with 200 tools", template.clone),
+    ):
+        elapsed = construct_time_us(factory)
+        failed |= elapsed > CONSTRUCT_BUDGET_US
+        print(f"{label:<44}{elapsed:>8.1f} us  (budget {CONSTRUCT_BUDGET_US:.0f} us)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
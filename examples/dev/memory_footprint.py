@@ -0,0 +1,71 @@
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import field, fields, make_dataclass
+
+from agentlauncher.events import (
+    LLMRequestEvent,
+    MessageDeltaStreamingEvent,
+    MessagesAddEvent,
+    ToolExecFinishEvent,
+    ToolsExecResultsEvent,
+)
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    ToolCallMessage,
+    ToolResultMessage,
+    UserMessage,
+)
+
+COUNT = 100_000
+
+SAMPLES: dict[type, tuple] = {
+    UserMessage: ("What is the weather in Paris?",),
+    AssistantMessage: ("It is sunny.",),
+    ToolCallMessage: ("call_1", "get_weather", {}),
+    ToolResultMessage: ("call_1", "get_weather", "sunny"),
+    MessageDeltaStreamingEvent: ("agent_1", "sun"),
+    MessagesAddEvent: ("agent_1", []),
+    LLMRequestEvent: ("agent_1", [], []),
+    ToolExecFinishEvent: ("agent_1", "call_1", "get_weather", "sunny"),
+    ToolsExecResultsEvent: ("agent_1", []),
+}
+
+
+def dict_based(cls: type) -> type:
+    return make_dataclass(
+        cls.__name__,
+        [
+            (
+                f.name,
+                f.type,
+                field(default=f.default, default_factory=f.default_factory),
+            )
+            for f in fields(cls)
+        ],
+    )
+
+
+def bytes_per_instance(factory: Callable[[], object]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / COUNT
+
+
+def main() -> None:
+    print(f"{'class':<28}{'__dict__':>10}{'slots':>10}{'saved':>10}")
+    for cls, args in SAMPLES.items():
+        legacy = dict_based(cls)
+        before = bytes_per_instance(lambda legacy=legacy, args=args: legacy(*args))
+        after = bytes_per_instance(lambda cls=cls, args=args: cls(*args))
+        print(
+            f"{cls.__name__:<28}{before:>10.0f}{after:>10.0f}"
+            f"{1 - after / before:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
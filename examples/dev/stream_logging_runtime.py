@@ -34,32 +34,24 @@ class StreamLoggingRuntime(RuntimeType):
             self.handle_tool_call_arguments_done_streaming_event,
         )
 
-    async def handle_message_start_streaming_event(
-        self, event: MessageStartStreamingEvent
-    ):
+    def handle_message_start_streaming_event(self, event: MessageStartStreamingEvent):
         print(f"[{event.agent_id}] ", end="", flush=True)
 
-    async def handle_message_delta_streaming_event(
-        self, event: MessageDeltaStreamingEvent
-    ):
+    def handle_message_delta_streaming_event(self, event: MessageDeltaStreamingEvent):
         print(f"{event.delta}", end="", flush=True)
 
-    async def handle_message_done_streaming_event(
-        self, event: MessageDoneStreamingEvent
-    ):
+    def handle_message_done_streaming_event(self, event: MessageDoneStreamingEvent):
         print()
 
-    async def handle_tool_call_name_streaming_event(
-        self, event: ToolCallNameStreamingEvent
-    ):
+    def handle_tool_call_name_streaming_event(self, event: ToolCallNameStreamingEvent):
         print(f"\n[{event.agent_id}] Tool call started: {event.tool_name}")
 
-    async def handle_tool_call_arguments_delta_streaming_event(
+    def handle_tool_call_arguments_delta_streaming_event(
         self, event: ToolCallArgumentsDeltaStreamingEvent
     ):
         print(f"{event.arguments_delta}", end="", flush=True)
 
-    async def handle_tool_call_arguments_done_streaming_event(
+    def handle_tool_call_arguments_done_streaming_event(
         self, event: ToolCallArgumentsDoneStreamingEvent
     ):
         print()
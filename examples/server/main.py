@@ -1,4 +1,3 @@
-import asyncio
 from collections.abc import AsyncIterator
 
 from fastapi import FastAPI, Response
@@ -6,7 +5,6 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from agentlauncher import AgentLauncher
-from agentlauncher.eventbus.type import EventType
 from examples.dev.gpt import gpt_handler
 from examples.dev.helper import register_tools
 
@@ -34,16 +32,12 @@ async def health_check() -> dict[str, str]:
 
 
 async def _stream_task(task: str) -> StreamingResponse:
-    queue: asyncio.Queue[EventType | None] = asyncio.Queue()
-
-    asyncio.create_task(launcher.run(task=task, event_hook=queue))
+    stream = launcher.stream(task=task, maxsize=256, policy="drop_deltas")
 
     async def event_generator() -> AsyncIterator[str]:
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            yield type(item).__name__ + "\n"
+        async with stream:
+            async for event in stream:
+                yield type(event).__name__ + "\n"
 
     return StreamingResponse(event_generator(), media_type="application/x-ndjson")
 
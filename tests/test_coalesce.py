@@ -0,0 +1,31 @@
+import asyncio
+
+from agentlauncher.eventbus import DeltaCoalescer, EventBus, EventHookQueue
+from agentlauncher.events import MessageDeltaStreamingEvent, MessageDoneStreamingEvent
+
+
+def test_timer_flush_stays_ahead_of_later_events():
+    async def main():
+        bus = EventBus(coalescer=DeltaCoalescer(window=0.01))
+        seen: list[object] = []
+        bus.subscribe(MessageDeltaStreamingEvent, seen.append)
+        bus.subscribe(MessageDoneStreamingEvent, seen.append)
+        deltas = EventHookQueue(maxsize=1, event_types=[MessageDeltaStreamingEvent])
+        await bus.add_hook("agent", deltas)
+        deltas.put_nowait(MessageDeltaStreamingEvent(agent_id="agent", delta="old"))
+
+        await bus.emit(MessageDeltaStreamingEvent(agent_id="agent", delta="he"))
+        await bus.emit(MessageDeltaStreamingEvent(agent_id="agent", delta="llo"))
+        await asyncio.sleep(0.05)
+        await bus.emit(MessageDoneStreamingEvent(agent_id="agent", message="hello"))
+        assert seen == []
+
+        await deltas.get()
+        await asyncio.sleep(0.01)
+        assert seen == [
+            MessageDeltaStreamingEvent(agent_id="agent", delta="hello"),
+            MessageDoneStreamingEvent(agent_id="agent", message="hello"),
+        ]
+        await bus.close()
+
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+import asyncio
+
+from agentlauncher.eventbus import EventBus, EventContext
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    SystemMessage,
+    ToolResultMessage,
+    UserMessage,
+)
+from agentlauncher.runtimes import ToolResultTruncator, TurnSummarizer
+from agentlauncher.runtimes.compaction import SUMMARY_PREFIX
+
+
+async def summarize(messages, tools, context):
+    return [AssistantMessage(content="the user said hi")]
+
+
+def test_truncator_after_summarizer_keeps_new_summary():
+    async def main():
+        context = EventContext(agent_id="agent", event_bus=EventBus())
+        summarizer = TurnSummarizer(
+            max_tokens=6, keep_tokens=5, llm_processor=summarize, estimator=lambda m: 1
+        )
+        truncator = ToolResultTruncator(max_chars=10)
+
+        async def process(messages):
+            return truncator(await summarizer(messages, context), context)
+
+        log = [
+            SystemMessage(content="system"),
+            UserMessage(content="hi"),
+            AssistantMessage(content="looking"),
+            ToolResultMessage(tool_call_id="1", tool_name="read", result="x" * 50),
+            AssistantMessage(content="done"),
+        ]
+        first = await process(log)
+        assert "truncated" in first[3].result
+
+        log += [UserMessage(content="more"), AssistantMessage(content="sure")]
+        second = await process(log)
+        assert second[1].content == SUMMARY_PREFIX + "the user said hi"
+        assert "truncated" in second[3].result
+        assert list(second[4:]) == log[4:]
+
+    asyncio.run(main())
+
+
+def test_truncator_returns_input_when_nothing_is_cut():
+    context = EventContext(agent_id="agent", event_bus=EventBus())
+    truncator = ToolResultTruncator(max_chars=10)
+    messages = [
+        UserMessage(content="hi"),
+        ToolResultMessage(tool_call_id="1", tool_name="read", result="short"),
+    ]
+    assert truncator(messages, context) is messages
+    messages.append(AssistantMessage(content="done"))
+    assert truncator(messages, context) is messages
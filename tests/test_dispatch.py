@@ -0,0 +1,35 @@
+import asyncio
+
+from agentlauncher.eventbus import EventBus
+from agentlauncher.events import AgentStartEvent
+
+
+def test_priority_orders_handlers_within_each_dispatch_class():
+    async def main():
+        bus = EventBus()
+        calls: list[str] = []
+
+        def inline(name: str):
+            def handler(event: AgentStartEvent) -> None:
+                calls.append(name)
+
+            return handler
+
+        def concurrent(name: str):
+            async def handler(event: AgentStartEvent) -> None:
+                calls.append(name)
+
+            return handler
+
+        bus.subscribe(AgentStartEvent, concurrent("async-low"), priority=0)
+        bus.subscribe(AgentStartEvent, concurrent("async-high"), priority=10)
+        bus.subscribe(AgentStartEvent, inline("inline-low"), priority=-5)
+        bus.subscribe(AgentStartEvent, inline("inline-high"), priority=5)
+
+        await bus.emit(AgentStartEvent(agent_id="agent"))
+        assert calls == ["inline-high", "inline-low"]
+        await asyncio.sleep(0)
+        assert calls == ["inline-high", "inline-low", "async-high", "async-low"]
+        await bus.close()
+
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+import asyncio
+
+from agentlauncher import AgentLauncher
+from agentlauncher.eventbus import EventHookQueue, EventJournal, read_journal
+from agentlauncher.eventbus.journal import replay_journal
+from agentlauncher.events import LLMRequestEvent, ToolsExecResultsEvent
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    ToolCallMessage,
+    ToolParamSchema,
+)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.llm_calls = 0
+        self.tool_calls = 0
+
+    async def answer(self, messages, tools, context):
+        self.llm_calls += 1
+        if len(messages) < 4:
+            return [ToolCallMessage("call-1", "lookup", {"key": "answer"})]
+        return [AssistantMessage(content=f"found {messages[-1].result}")]
+
+    def lookup(self, key: str) -> str:
+        self.tool_calls += 1
+        return key.upper()
+
+
+def make_launcher(recorder: Recorder) -> AgentLauncher:
+    launcher = AgentLauncher(sub_agent_tool=False)
+    launcher.set_primary_agent_llm_processor(recorder.answer)
+    launcher.register_tool(
+        "lookup",
+        recorder.lookup,
+        "Look up a key.",
+        {"key": ToolParamSchema(type="string", description="Key.", required=True)},
+    )
+    return launcher
+
+
+async def journaled_task(directory) -> tuple[str, str | None]:
+    recorder = Recorder()
+    launcher = make_launcher(recorder)
+    journal = EventJournal(directory)
+    journal.attach(launcher.event_bus)
+    hook = EventHookQueue()
+    result = await launcher.run("find the answer", event_hook=hook)
+    await journal.close()
+    await launcher.shutdown()
+    agent_id = next(read_journal(directory)).agent_id
+    assert recorder.llm_calls == 2 and recorder.tool_calls == 1
+    return agent_id, result
+
+
+def test_replay_does_not_call_the_llm_processor(tmp_path):
+    async def main():
+        agent_id, _ = await journaled_task(tmp_path)
+        recorder = Recorder()
+        launcher = make_launcher(recorder)
+        requests: list[LLMRequestEvent] = []
+        launcher.event_bus.subscribe(LLMRequestEvent, requests.append, remote=True)
+        hook = EventHookQueue()
+        await launcher.event_bus.add_hook(agent_id, hook)
+        count = await replay_journal(tmp_path, launcher.event_bus, agent_id)
+        await asyncio.sleep(0.05)
+        assert count == hook.qsize() > 0
+        assert len(requests) == 2
+        assert recorder.llm_calls == 0 and recorder.tool_calls == 0
+
+    asyncio.run(main())
+
+
+def test_resume_reuses_recorded_responses(tmp_path):
+    async def main():
+        agent_id, result = await journaled_task(tmp_path / "full")
+        recorder = Recorder()
+        launcher = make_launcher(recorder)
+        assert await launcher.resume(tmp_path / "full", agent_id) == result
+        assert recorder.llm_calls == 0 and recorder.tool_calls == 0
+
+        partial = EventJournal(tmp_path / "partial")
+        for event in read_journal(tmp_path / "full", agent_id=agent_id):
+            if isinstance(event, ToolsExecResultsEvent):
+                break
+            partial.append(event)
+        await partial.close()
+        assert await launcher.resume(tmp_path / "partial", agent_id) == result
+        assert recorder.llm_calls == 1 and recorder.tool_calls == 1
+
+    asyncio.run(main())
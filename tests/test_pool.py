@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from agentlauncher import AgentLauncher, AgentLauncherPool
+from agentlauncher.eventbus import EventHookQueue
+from agentlauncher.llm_interface import AssistantMessage
+
+
+async def answer(messages, tools, context):
+    return [AssistantMessage(content=f"done: {messages[-1].content}")]
+
+
+def setup(launcher: AgentLauncher) -> None:
+    launcher.set_primary_agent_llm_processor(answer)
+
+
+def test_undrained_stream_does_not_stall_other_tasks():
+    async def main():
+        async with AgentLauncherPool(setup, workers=1, sub_agent_tool=False) as pool:
+            stuck = EventHookQueue(maxsize=1, policy="block")
+            first = asyncio.create_task(pool.run("first", event_hook=stuck))
+            second = await asyncio.wait_for(pool.run("second", timeout=10), 20)
+            assert second == "done: second"
+            assert await asyncio.wait_for(first, 20) == "done: first"
+            assert stuck.qsize() == 1
+
+    asyncio.run(main())
+
+
+def test_unserializable_event_fails_the_run():
+    async def main():
+        async with AgentLauncherPool(setup, workers=1, sub_agent_tool=False) as pool:
+            with pytest.raises(TypeError):
+                await asyncio.wait_for(
+                    pool.run("locked", session_context={"lock": threading.Lock()}),
+                    20,
+                )
+            assert await asyncio.wait_for(pool.run("next"), 20) == "done: next"
+
+    asyncio.run(main())
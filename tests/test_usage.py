@@ -0,0 +1,34 @@
+from agentlauncher.eventbus import EventBus
+from agentlauncher.llm_interface import (
+    AssistantMessage,
+    MessageView,
+    SystemMessage,
+    UserMessage,
+)
+from agentlauncher.runtimes import UsageRuntime
+
+
+def estimate(message) -> int:
+    return len(message.content)
+
+
+def test_prompt_tokens_after_compaction_rewrites_the_head():
+    usage = UsageRuntime(EventBus(), estimator=estimate)
+    log = [
+        SystemMessage(content="system"),
+        UserMessage(content="a long first question"),
+        AssistantMessage(content="answer"),
+        UserMessage(content="next"),
+    ]
+    assert usage.prompt_tokens("agent", log) == sum(map(estimate, log))
+
+    compacted = [log[0], UserMessage(content="summary"), log[2], log[3]]
+    assert usage.prompt_tokens("agent", compacted) == sum(map(estimate, compacted))
+
+
+def test_prompt_tokens_reuses_the_shared_log():
+    usage = UsageRuntime(EventBus(), estimator=estimate)
+    log = [SystemMessage(content="system"), UserMessage(content="question")]
+    usage.prompt_tokens("agent", MessageView(log))
+    log.append(AssistantMessage(content="answer"))
+    assert usage.prompt_tokens("agent", MessageView(log)) == sum(map(estimate, log))